@@ -0,0 +1,218 @@
+"""Simulate a fleet of Sensus Analytics config entries against the mock portal.
+
+Run from the repository root::
+
+    python -m benchmarks.fleet --entries 100 500 1000 --meters-per-account 2
+
+Each simulated entry gets its own coordinator, set up as ``async_setup_entry``
+does: all first refreshes start together, as after a Home Assistant restart,
+and the coordinators then poll on their own schedules. Time is accelerated by
+dividing the configured poll intervals by ``--speedup``, so a few wall-clock
+minutes cover hours of polling.
+
+For each fleet size the report lists the portal requests per endpoint, the
+peak number of requests in flight at the portal, the peak thread count (which
+includes the executor), the memory allocated per coordinator during setup and
+the first refresh, the event loop lag, and the refresh durations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from custom_components.sensus_analytics.const import CONF_MAX_POLL_INTERVAL, CONF_MIN_POLL_INTERVAL
+
+from .harness import BenchConfigEntry, async_bench_hass, create_coordinator, entry_data
+from .mock_portal import MockPortal, MockPortalConfig, account_meter
+
+# How often the event loop lag and thread count are sampled, in seconds
+SAMPLE_INTERVAL = 0.05
+
+
+def percentile(values, fraction):
+    """Return a percentile of a list of values."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class LoopMonitor:
+    """Sample the event loop lag and the process thread count in the background."""
+
+    def __init__(self):
+        """Initialize the monitor."""
+        self.lags: list[float] = []
+        self.peak_threads = threading.active_count()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._async_sample())
+
+    async def async_stop(self):
+        """Stop sampling."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _async_sample(self):
+        """Measure how late each wake-up of a periodic sleep is."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            self.lags.append((loop.time() - start - SAMPLE_INTERVAL) * 1000)
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+
+async def async_simulate(entries, args):
+    """Run one fleet of the given size and return its report."""
+    accounts = -(-entries // args.meters_per_account)
+    portal = MockPortal(
+        MockPortalConfig(
+            latency=args.latency / 1000,
+            devices_per_account=args.meters_per_account,
+            seed=args.seed,
+        )
+    )
+    base_url = await portal.async_start()
+    try:
+        async with async_bench_hass() as hass:
+            monitor = LoopMonitor()
+            monitor.start()
+
+            # Memory is traced over setup and the first refresh only, as tracing slows everything down
+            tracemalloc.start()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            coordinators = []
+            for index in range(entries):
+                account = str(1000 + index % accounts)
+                meter = account_meter(account, index // accounts)
+                data = entry_data(
+                    base_url,
+                    account,
+                    meter,
+                    username=f"user{account}",
+                    **{
+                        CONF_MIN_POLL_INTERVAL: args.min_interval / args.speedup,
+                        CONF_MAX_POLL_INTERVAL: args.max_interval / args.speedup,
+                    },
+                )
+                coordinators.append(create_coordinator(hass, BenchConfigEntry(f"entry{index}", data)))
+
+            startup = time.perf_counter()
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+            startup = time.perf_counter() - startup
+            memory_per_coordinator = (tracemalloc.get_traced_memory()[0] - memory_before) / entries
+            tracemalloc.stop()
+            startup_requests = dict(portal.requests)
+            startup_peak = portal.peak_concurrency
+
+            # A listener keeps each coordinator polling on its schedule, as the sensors would
+            unsubscribes = [coordinator.async_add_listener(lambda: None) for coordinator in coordinators]
+            await asyncio.sleep(args.duration)
+            for unsubscribe in unsubscribes:
+                unsubscribe()
+
+            await monitor.async_stop()
+            refresh_summaries = [
+                coordinator.metrics.durations["refresh"].as_dict()
+                for coordinator in coordinators
+                if "refresh" in coordinator.metrics.durations
+            ]
+            report = {
+                "entries": entries,
+                "accounts": accounts,
+                "startup_seconds": round(startup, 3),
+                "startup_requests": startup_requests,
+                "startup_peak_concurrency": startup_peak,
+                "requests": dict(portal.requests),
+                "requests_per_simulated_hour": round(portal.request_count / (args.duration * args.speedup / 3600), 1),
+                "peak_concurrency": portal.peak_concurrency,
+                "peak_threads": monitor.peak_threads,
+                "memory_per_coordinator_kib": round(memory_per_coordinator / 1024, 1),
+                "loop_lag_ms": {
+                    "p50": round(percentile(monitor.lags, 0.5) or 0, 2),
+                    "p99": round(percentile(monitor.lags, 0.99) or 0, 2),
+                    "max": round(max(monitor.lags, default=0), 2),
+                },
+                # Median of the coordinators' medians, and the worst coordinator's p95 and maximum
+                "refresh_ms": {
+                    "p50": statistics.median(summary["p50"] for summary in refresh_summaries),
+                    "p95": max(summary["p95"] for summary in refresh_summaries),
+                    "max": max(summary["max"] for summary in refresh_summaries),
+                },
+                "failed_entries": sum(not coordinator.last_update_success for coordinator in coordinators),
+            }
+
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+    finally:
+        await portal.async_stop()
+    return report
+
+
+def print_report(reports):
+    """Print the reports as a table with one column per fleet size."""
+    rows = (
+        ("entries", lambda r: r["entries"]),
+        ("startup s", lambda r: r["startup_seconds"]),
+        ("startup peak in flight", lambda r: r["startup_peak_concurrency"]),
+        ("logins", lambda r: r["requests"].get("login", 0)),
+        ("widget requests", lambda r: r["requests"].get("widget", 0)),
+        ("usage requests", lambda r: r["requests"].get("usage", 0)),
+        ("requests / sim. hour", lambda r: r["requests_per_simulated_hour"]),
+        ("peak in flight", lambda r: r["peak_concurrency"]),
+        ("peak threads", lambda r: r["peak_threads"]),
+        ("KiB / coordinator", lambda r: r["memory_per_coordinator_kib"]),
+        ("loop lag p50 ms", lambda r: r["loop_lag_ms"]["p50"]),
+        ("loop lag p99 ms", lambda r: r["loop_lag_ms"]["p99"]),
+        ("loop lag max ms", lambda r: r["loop_lag_ms"]["max"]),
+        ("refresh p50 ms", lambda r: r["refresh_ms"]["p50"]),
+        ("refresh p95 ms", lambda r: r["refresh_ms"]["p95"]),
+        ("failed entries", lambda r: r["failed_entries"]),
+    )
+    for label, value in rows:
+        print(f"{label:<24}" + "".join(f"{str(value(report)):>12}" for report in reports))
+
+
+def main(argv=None):
+    """Run the fleet simulation from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 500, 1000], help="fleet sizes to simulate")
+    parser.add_argument("--meters-per-account", type=int, default=1, help="meters sharing each login")
+    parser.add_argument("--latency", type=float, default=50.0, help="portal latency per request in milliseconds")
+    parser.add_argument("--duration", type=float, default=60.0, help="wall-clock seconds of polling per fleet")
+    parser.add_argument("--speedup", type=float, default=60.0, help="factor by which poll intervals are shortened")
+    parser.add_argument("--min-interval", type=float, default=5, help="minimum poll interval in minutes")
+    parser.add_argument("--max-interval", type=float, default=60, help="maximum poll interval in minutes")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic portal data")
+    parser.add_argument("--json", metavar="PATH", help="write the reports to a file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    reports = []
+    for entries in args.entries:
+        print(f"Simulating {entries} entries...", file=sys.stderr)
+        reports.append(asyncio.run(async_simulate(entries, args)))
+    print_report(reports)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"config": vars(args), "reports": reports}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
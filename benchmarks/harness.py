@@ -0,0 +1,96 @@
+"""Minimal Home Assistant instance for driving coordinators in benchmarks."""
+
+from __future__ import annotations
+
+import tempfile
+from contextlib import asynccontextmanager
+
+from homeassistant import config_entries
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import frame
+
+from custom_components.sensus_analytics.const import (
+    CONF_ACCOUNT_NUMBER,
+    CONF_BACKFILL_DAYS,
+    CONF_BASE_URL,
+    CONF_METER_NUMBER,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DOMAIN,
+)
+from custom_components.sensus_analytics.coordinator import SensusAnalyticsDataUpdateCoordinator
+
+# Fixed so that day boundaries, and with them the requested windows, are the same on every machine
+TIME_ZONE = "America/Chicago"
+
+
+class BenchConfigEntry:
+    """Stand-in for a config entry that is never added to the config entries manager."""
+
+    def __init__(self, entry_id, data):
+        """Initialize the entry."""
+        self.entry_id = entry_id
+        self.domain = DOMAIN
+        self.title = entry_id
+        self.data = data
+        self.options = {}
+        self.pref_disable_polling = False
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        """Keep a callback to run when the entry is torn down."""
+        self._on_unload.append(func)
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        """Run a background task on the instance."""
+        return hass.async_create_background_task(target, name, eager_start=eager_start)
+
+    async def async_unload(self):
+        """Run the unload callbacks."""
+        while self._on_unload:
+            if (result := self._on_unload.pop()()) is not None:
+                await result
+
+
+def entry_data(base_url, account, meter, username="bench", **extra):
+    """Return config entry data for one meter on the mock portal."""
+    return {
+        CONF_BASE_URL: base_url,
+        CONF_USERNAME: username,
+        CONF_PASSWORD: "password",
+        CONF_ACCOUNT_NUMBER: account,
+        CONF_METER_NUMBER: meter,
+        CONF_BACKFILL_DAYS: 0,
+        "unit_type": "gal",
+        "tier1_gallons": 5000,
+        "tier1_price": 0.005,
+        "tier2_gallons": 10000,
+        "tier2_price": 0.007,
+        "tier3_price": 0.01,
+        "service_fee": 15.0,
+        **extra,
+    }
+
+
+@asynccontextmanager
+async def async_bench_hass():
+    """Yield a running Home Assistant instance backed by a temporary config directory."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await hass.config.async_set_time_zone(TIME_ZONE)
+        hass.config.currency = "USD"
+        frame.async_setup(hass)
+        hass.set_state(CoreState.running)
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+def create_coordinator(hass, entry: BenchConfigEntry) -> SensusAnalyticsDataUpdateCoordinator:
+    """Create a coordinator for an entry, as async_setup_entry does."""
+    token = config_entries.current_entry.set(entry)
+    try:
+        return SensusAnalyticsDataUpdateCoordinator(hass, entry)
+    finally:
+        config_entries.current_entry.reset(token)
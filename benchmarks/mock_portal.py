@@ -0,0 +1,180 @@
+"""Local stand-in for the Sensus Analytics portal.
+
+Serves ``j_spring_security_check``, ``water/widget/byPage`` and
+``water/usage/{account}/{meter}`` from the canned payloads in ``payloads/``,
+filled with synthetic values. Every value is derived from a fixed seed and the
+request parameters, so two runs against the same configuration see identical
+responses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import random
+import secrets
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from aiohttp import web
+
+PAYLOAD_DIR = Path(__file__).parent / "payloads"
+SESSION_COOKIE = "JSESSIONID"
+# Password the portal rejects, for exercising failed logins
+INVALID_PASSWORD = "invalid"
+HOUR_MS = 3600 * 1000
+
+
+@dataclass
+class MockPortalConfig:
+    """Behaviour of the mock portal."""
+
+    # Seconds added before every response
+    latency: float = 0.0
+    # Devices listed in an account-wide widget response
+    devices_per_account: int = 1
+    # Filler bytes added to every device, to inflate widget payloads
+    device_padding: int = 0
+    # Rows returned by every usage request; None returns one row per hour requested
+    usage_rows: int | None = None
+    # Requests a session serves before it expires; None keeps sessions forever
+    session_lifetime: int | None = None
+    seed: int = 0
+
+
+class MockPortal:
+    """aiohttp application imitating the Sensus Analytics portal."""
+
+    def __init__(self, config: MockPortalConfig | None = None):
+        """Initialize the portal."""
+        self.config = config or MockPortalConfig()
+        self.requests: Counter = Counter()
+        self.active = 0
+        self.peak_concurrency = 0
+        self._sessions: dict[str, int] = {}
+        self._widget = json.loads((PAYLOAD_DIR / "widget.json").read_text())
+        self._usage = json.loads((PAYLOAD_DIR / "usage.json").read_text())
+        self._runner: web.AppRunner | None = None
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post("/j_spring_security_check", self._handle_login, name="login")
+        self.app.router.add_post("/water/widget/byPage", self._handle_widget, name="widget")
+        self.app.router.add_get("/water/usage/{account}/{meter}", self._handle_usage, name="usage")
+
+    async def async_start(self, host="127.0.0.1", port=0) -> str:
+        """Start serving and return the portal base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        # The client's cookie jar ignores cookies set by bare IP addresses
+        return f"http://localhost:{port}/"
+
+    async def async_stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def request_count(self):
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        """Count requests and concurrency and apply the configured latency."""
+        self.requests[request.match_info.route.name] += 1
+        self.active += 1
+        self.peak_concurrency = max(self.peak_concurrency, self.active)
+        try:
+            if self.config.latency:
+                await asyncio.sleep(self.config.latency)
+            return await handler(request)
+        finally:
+            self.active -= 1
+
+    async def _handle_login(self, request):
+        """Issue a session cookie for valid credentials."""
+        form = await request.post()
+        if not form.get("j_username") or form.get("j_password") == INVALID_PASSWORD:
+            return web.Response(status=302, headers={"Location": "/login?login_error=1"})
+        token = secrets.token_hex(16)
+        self._sessions[token] = self.config.session_lifetime or -1
+        response = web.Response(status=302, headers={"Location": "/"})
+        response.set_cookie(SESSION_COOKIE, token)
+        return response
+
+    def _check_session(self, request):
+        """Return a redirect to the login page unless the request has a live session."""
+        token = request.cookies.get(SESSION_COOKIE)
+        remaining = self._sessions.get(token)
+        if remaining is None or remaining == 0:
+            self._sessions.pop(token, None)
+            return web.Response(status=302, headers={"Location": "/login"})
+        if remaining > 0:
+            self._sessions[token] = remaining - 1
+        return None
+
+    async def _handle_widget(self, request):
+        """Return the devices of an account, or the single device asked for."""
+        if (redirect := self._check_session(request)) is not None:
+            return redirect
+        body = await request.json()
+        account = str(body.get("accountNumber"))
+        if (device_id := body.get("deviceId")) is not None:
+            meters = [str(device_id)]
+        else:
+            meters = [account_meter(account, index) for index in range(self.config.devices_per_account)]
+        payload = copy.deepcopy(self._widget)
+        payload["widgetList"][0]["data"]["devices"] = [self._device(account, meter) for meter in meters]
+        return web.json_response(payload)
+
+    async def _handle_usage(self, request):
+        """Return hourly rows covering the requested window."""
+        if (redirect := self._check_session(request)) is not None:
+            return redirect
+        start = int(request.query["start"])
+        end = int(request.query["end"])
+        rows = self.config.usage_rows or max((end - start) // HOUR_MS + 1, 1)
+        rng = self._rng("usage", request.match_info["account"], request.match_info["meter"], start)
+        payload = copy.deepcopy(self._usage)
+        payload["data"]["usage"] = [payload["data"]["usage"][0]] + [
+            [
+                start + hour * HOUR_MS,
+                round(rng.uniform(0, 0.05), 3),
+                round(rng.choice((0.0, 0.0, 0.0, rng.uniform(0, 0.2))), 2),
+                round(rng.uniform(40, 95), 1),
+            ]
+            for hour in range(rows)
+        ]
+        return web.json_response(payload)
+
+    def _device(self, account, meter):
+        """Return a synthetic device payload built on the canned one."""
+        rng = self._rng("device", account, meter)
+        device = dict(self._widget["widgetList"][0]["data"]["devices"][0])
+        device.update(
+            {
+                "meterId": meter,
+                "meterLat": round(rng.uniform(25, 48), 4),
+                "meterLong": round(rng.uniform(-124, -70), 4),
+                "dailyUsage": round(rng.uniform(0.5, 3), 2),
+                "billingUsage": round(rng.uniform(5, 40), 2),
+                "latestReadUsage": round(rng.uniform(1000, 20000), 2),
+            }
+        )
+        if self.config.device_padding:
+            device["padding"] = "x" * self.config.device_padding
+        return device
+
+    def _rng(self, *key):
+        """Return a random generator seeded from the configuration seed and a key."""
+        return random.Random(":".join(str(part) for part in (self.config.seed, *key)))
+
+
+def account_meter(account, index):
+    """Return the meter number the portal assigns to a device of an account."""
+    return f"{account}{index:02d}"
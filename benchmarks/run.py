@@ -0,0 +1,252 @@
+"""Benchmark the hot paths of the Sensus Analytics Integration against the mock portal.
+
+Run from the repository root::
+
+    python -m benchmarks.run --json results.json
+    python -m benchmarks.run --compare results.json
+
+Measures the end-to-end coordinator refresh (cold: login, widget and usage
+requests; warm: the widget request with the hourly day cached), the hourly
+response parser, the streamed usage request, the derived view and the sensors' published values. Timings
+are reported in microseconds per call. With ``--compare`` the medians are
+checked against an earlier result file, and the exit status is non-zero when
+any of them regressed by more than ``--threshold`` percent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from custom_components.sensus_analytics import sensor
+from custom_components.sensus_analytics.coordinator import USAGE_ROWS_PATH
+from custom_components.sensus_analytics.derived import build_derived_data
+
+from .harness import BenchConfigEntry, async_bench_hass, create_coordinator, entry_data
+from .mock_portal import MockPortal, MockPortalConfig
+
+ACCOUNT = "1000"
+METER = "100000"
+# Sizes of the usage responses fed to the parsers: one day and one month of hours
+PARSE_ROWS = (24, 744)
+
+SENSOR_CLASSES = (
+    sensor.SensusAnalyticsDailyUsageSensor,
+    sensor.SensusAnalyticsUsageUnitSensor,
+    sensor.SensusAnalyticsMeterAddressSensor,
+    sensor.SensusAnalyticsLastReadSensor,
+    sensor.SensusAnalyticsMeterLongitudeSensor,
+    sensor.SensusAnalyticsMeterIdSensor,
+    sensor.SensusAnalyticsMeterLatitudeSensor,
+    sensor.MeterOdometerSensor,
+    sensor.SensusAnalyticsBillingUsageSensor,
+    sensor.LastHourUsageSensor,
+    sensor.LastHourRainfallSensor,
+    sensor.LastHourTemperatureSensor,
+    sensor.LastHourTimestampSensor,
+    sensor.SensusAnalyticsRefreshDurationSensor,
+    sensor.SensusAnalyticsReauthCountSensor,
+)
+CURRENCY_SENSOR_CLASSES = (sensor.SensusAnalyticsBillingCostSensor, sensor.SensusAnalyticsDailyFeeSensor)
+
+
+def summarize(samples_ns, **extra):
+    """Return the statistics of per-call samples in microseconds."""
+    samples = sorted(sample / 1000 for sample in samples_ns)
+    return {
+        "runs": len(samples),
+        "min": round(samples[0], 2),
+        "median": round(statistics.median(samples), 2),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        **extra,
+    }
+
+
+def time_sync(func, number, repeat):
+    """Return the mean time per call of func in nanoseconds for each of repeat runs."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter_ns() - start) / number)
+        return samples
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+async def time_refresh(coordinator, repeat, before=None):
+    """Return the duration of repeat coordinator refreshes in nanoseconds."""
+    samples = []
+    for _ in range(repeat):
+        if before is not None:
+            await before()
+        start = time.perf_counter_ns()
+        await coordinator.async_refresh()
+        samples.append(time.perf_counter_ns() - start)
+        if not coordinator.last_update_success:
+            raise RuntimeError(f"Refresh failed: {coordinator.last_exception}")
+    return samples
+
+
+async def async_run(args):
+    """Run every benchmark and return the results."""
+    portal = MockPortal(
+        MockPortalConfig(
+            latency=args.latency / 1000,
+            device_padding=args.padding,
+            seed=args.seed,
+        )
+    )
+    base_url = await portal.async_start()
+    results = {}
+    try:
+        async with async_bench_hass() as hass:
+            entry = BenchConfigEntry("bench", entry_data(base_url, ACCOUNT, METER))
+            coordinator = create_coordinator(hass, entry)
+
+            async def reset_coordinator():
+                await coordinator.session.async_close()
+                coordinator._hourly_cache.clear()
+                coordinator._hourly_fetched_at.clear()
+
+            results["refresh.cold"] = summarize(await time_refresh(coordinator, args.repeat, reset_coordinator))
+            await time_refresh(coordinator, 1)
+            results["refresh.warm"] = summarize(await time_refresh(coordinator, args.repeat))
+
+            target_date = next(iter(coordinator._hourly_cache))
+            usage_path, params = coordinator._construct_hourly_data_request(
+                *coordinator._get_start_end_timestamps(target_date)
+            )
+            for rows in PARSE_ROWS:
+                portal.config.usage_rows = rows
+                # Collect the rows as the coordinator's request streams them, then parse the whole payload
+                rows_seen = []
+                payload, _ = await coordinator.session.async_get_json_stream(
+                    usage_path, USAGE_ROWS_PATH, rows_seen.append, params=params
+                )
+                payload["data"]["usage"] = rows_seen
+                samples = time_sync(lambda: coordinator._process_hourly_data_response(payload), 20, args.repeat)
+                results[f"parse_hourly.{rows}"] = summarize(
+                    samples, rows_per_second=round(rows * 1e9 / statistics.median(samples))
+                )
+
+                # The request as the coordinator makes it, with the rows decoded while they stream in
+                samples = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter_ns()
+                    await coordinator._async_get_usage(usage_path, params)
+                    samples.append(time.perf_counter_ns() - start)
+                results[f"fetch_hourly.{rows}"] = summarize(samples)
+            portal.config.usage_rows = None
+
+            results["derived.build"] = summarize(
+                time_sync(
+                    lambda: build_derived_data(coordinator.data, coordinator.metadata, entry.data, coordinator.tariff),
+                    200,
+                    args.repeat,
+                )
+            )
+
+            sensors = [cls(coordinator, entry) for cls in SENSOR_CLASSES]
+            sensors += [cls(coordinator, entry, hass.config.currency) for cls in CURRENCY_SENSOR_CLASSES]
+
+            def read_values():
+                for entity in sensors:
+                    entity.native_value
+
+            def read_state_keys():
+                for entity in sensors:
+                    entity._state_key()
+
+            results["sensors.native_value"] = summarize(time_sync(read_values, 200, args.repeat), sensors=len(sensors))
+            results["sensors.state_key"] = summarize(time_sync(read_state_keys, 200, args.repeat), sensors=len(sensors))
+
+            await coordinator.async_shutdown()
+            await entry.async_unload()
+    finally:
+        await portal.async_stop()
+    return results
+
+
+def git_revision():
+    """Return the current commit, if the benchmarks run from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print the change of each median against a baseline; return True if any regressed."""
+    regressed = False
+    print(f"\n{'benchmark':<24}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        change = (result["median"] - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressed = True
+            flag = "  REGRESSION"
+        print(f"{name:<24}{before:>12.2f}{result['median']:>12.2f}{change:>9.1f}%{flag}")
+    return regressed
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0, help="portal latency per request in milliseconds")
+    parser.add_argument("--padding", type=int, default=0, help="filler bytes added to every widget device")
+    parser.add_argument("--repeat", type=int, default=30, help="runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic portal data")
+    parser.add_argument("--json", metavar="PATH", help="write the results to a file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against an earlier result file")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed median regression in percent")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(async_run(args))
+
+    print(f"{'benchmark':<24}{'median us':>12}{'min us':>12}{'p95 us':>12}")
+    for name, result in results.items():
+        print(f"{name:<24}{result['median']:>12.2f}{result['min']:>12.2f}{result['p95']:>12.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "revision": git_revision(),
+                    "python": platform.python_version(),
+                    "config": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline["results"], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,24 +4,58 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import SensusAnalyticsDataUpdateCoordinator
+from .const import CONF_ACCOUNT_NUMBER, CONF_METER_NUMBER, DOMAIN
+from .coordinator import SensusAnalyticsDataUpdateCoordinator, snapshot_store, usage_archive
+from .services import async_setup_services
+from .statistics import statistics_store
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Sensus Analytics services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Sensus Analytics from a config entry."""
     coordinator = SensusAnalyticsDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore_snapshot():
+        # Serve entities from the last known data and refresh in the background
+        entry.async_create_background_task(hass, coordinator.async_spread_refresh(), f"{DOMAIN}_first_refresh")
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
 
+    # Import newly available hours into long-term statistics after refreshes
+    entry.async_on_unload(coordinator.async_add_listener(coordinator.statistics_importer.async_schedule))
+    entry.async_on_unload(entry.add_update_listener(async_update_listener))
+    # The last hour and daily values move on every hour, whether or not a poll is due
+    entry.async_on_unload(async_track_time_change(hass, coordinator.async_hourly_tick, minute=0, second=0))
+
     return True
 
 
+async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply a changed config entry to the coordinator."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if coordinator.identity_changed():
+        # The coordinator is bound to its login and meter; the reloaded entry
+        # picks up the session the options flow validated
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.async_config_entry_updated()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a Sensus Analytics config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
@@ -29,3 +63,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the snapshot, statistics progress and usage archive of a removed entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
+    await statistics_store(hass, entry.entry_id).async_remove()
+    await usage_archive(hass, entry.data[CONF_ACCOUNT_NUMBER], entry.data[CONF_METER_NUMBER]).async_remove()
@@ -0,0 +1,459 @@
+"""Client for the Sensus Analytics web portal."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_ACCOUNT_CLIENTS, DOMAIN
+from .jsonstream import JsonStreamDecoder
+from .metrics import record_phase, record_size, record_unchanged
+from .resilience import is_transient
+from .scheduler import HostRequestScheduler, async_get_host_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Query parameters the portal adds when it sends a rejected login back to the login page
+LOGIN_ERROR_PARAMETERS = ("login_error", "error")
+# How long one widget response is shared between the meters of an account
+WIDGET_SHARE_WINDOW = 120
+# Device fields that may carry the configured meter number
+DEVICE_ID_FIELDS = ("meterId", "deviceId", "meterNumber")
+# Path of the device list inside a widget response
+WIDGET_DEVICES_PATH = ("widgetList", 0, "data", "devices")
+# Bytes read from a streamed response at a time
+STREAM_CHUNK_SIZE = 1 << 16
+# How long a client no meter uses is kept logged in for an entry to pick it up,
+# e.g. after a config flow validated it or while its entry reloads
+UNCLAIMED_CLIENT_TIMEOUT = 300
+
+
+class SensusAnalyticsError(Exception):
+    """Base error raised by the Sensus Analytics client."""
+
+
+class SensusAnalyticsAuthError(SensusAnalyticsError):
+    """Raised when the portal rejects the configured credentials."""
+
+
+class SensusAnalyticsSessionExpired(SensusAnalyticsError):
+    """Raised when the portal no longer accepts the current session."""
+
+
+class SensusAnalyticsHostUnavailable(SensusAnalyticsError):
+    """Raised instead of sending a request while the portal host's circuit is open."""
+
+    def __init__(self, host, retry_after):
+        """Initialize the error with the time until requests are allowed again, if known."""
+        if retry_after is None:
+            super().__init__(f"{host} is unavailable, waiting for a trial request to complete")
+        else:
+            super().__init__(f"{host} is unavailable, requests are suspended for {retry_after}")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class PayloadVersion:
+    """Identifies a response body, so an identical one can be recognized without processing it."""
+
+    fingerprint: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class SensusAnalyticsSession:  # pylint: disable=too-many-instance-attributes
+    """Long-lived authenticated session against the Sensus Analytics portal.
+
+    Requests go through Home Assistant's shared aiohttp connector, so TCP/TLS
+    connections are pooled with the rest of Home Assistant, while the portal
+    cookie lives in a jar of its own. The portal is only asked to log in again
+    when a request comes back looking like an expired session, and that
+    request is then retried once. Every request, logins included, waits for a
+    slot from the scheduler shared by all entries against the same host, and
+    is refused outright while that host's circuit breaker is open.
+    """
+
+    def __init__(self, hass: HomeAssistant, base_url, username, password, scheduler: HostRequestScheduler):
+        """Initialize the session manager."""
+        self.hass = hass
+        self.base_url = base_url
+        self.username = username
+        self.scheduler = scheduler
+        self._password = password
+        self._session: aiohttp.ClientSession | None = None
+        self._authenticated = False
+        self._login_lock = asyncio.Lock()
+        self.request_count = 0
+        self.login_count = 0
+        self.reauth_count = 0
+
+    @property
+    def authenticated(self):
+        """Return True if a logged-in session is currently held."""
+        return self._authenticated
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the client session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = async_create_clientsession(self.hass, cookie_jar=aiohttp.CookieJar())
+        return self._session
+
+    async def async_login(self):
+        """Log in to the portal, replacing any existing session cookie."""
+        session = self._get_session()
+        session.cookie_jar.clear()
+        self._authenticated = False
+        login_url = urljoin(self.base_url, "j_spring_security_check")
+        _LOGGER.debug("Authentication URL: %s", login_url)
+        async with self._async_request_slot():
+            with record_phase("auth"):
+                async with session.post(
+                    login_url,
+                    data={"j_username": self.username, "j_password": self._password},
+                    allow_redirects=False,
+                    timeout=REQUEST_TIMEOUT,
+                ) as r_sec:
+                    self.login_count += 1
+                    # Check if login was successful
+                    if r_sec.status in (401, 403) or _is_login_error(r_sec):
+                        _LOGGER.error("Authentication failed with status code %s", r_sec.status)
+                        raise SensusAnalyticsAuthError("Authentication failed")
+                    # Server errors and throttling are retried like any other request
+                    r_sec.raise_for_status()
+                    if r_sec.status not in REDIRECT_STATUSES:
+                        raise SensusAnalyticsError(f"Unexpected status {r_sec.status} from the login request")
+
+        _LOGGER.debug("Authentication successful")
+        self._authenticated = True
+
+    def uses_password(self, password):
+        """Return True if the session logs in with this password."""
+        return password == self._password
+
+    def set_password(self, password):
+        """Use a new password, logging in again on the next request if it changed."""
+        if password != self._password:
+            self._password = password
+            self._authenticated = False
+
+    async def async_close(self):
+        """Drop the current session and its cookie."""
+        self._authenticated = False
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def async_get_json_stream(self, path, array_path, on_item, params=None, previous=None):
+        """Issue a GET request, handing the elements of one array of the body to on_item as they arrive.
+
+        Returns the rest of the body (see JsonStreamDecoder) and its
+        PayloadVersion. With the version of an earlier response as previous,
+        the request is made conditional on the ETag and Last-Modified the
+        portal sent with it; if the body is unchanged, previous itself is
+        returned, with None for the body when the portal answered 304.
+        """
+        return await self._async_request_json(
+            "GET", path, stream=(array_path, on_item, previous), params=params, headers=_conditional_headers(previous)
+        )
+
+    async def async_post_json_stream(self, path, payload, array_path, on_item, previous=None):
+        """Issue a POST request with a JSON body, streaming one array of the response like async_get_json_stream."""
+        return await self._async_request_json(
+            "POST", path, stream=(array_path, on_item, previous), json=payload, headers=_conditional_headers(previous)
+        )
+
+    async def async_ensure_login(self):
+        """Log in unless a valid session is already held."""
+        async with self._login_lock:
+            if not self._authenticated:
+                await self.async_login()
+
+    async def _async_request_json(self, method, path, **kwargs):
+        """Send a request, logging in again once if the session has expired."""
+        await self.async_ensure_login()
+        login_count = self.login_count
+        try:
+            return await self._async_send(method, path, **kwargs)
+        except SensusAnalyticsSessionExpired as error:
+            async with self._login_lock:
+                # A concurrent request may already have logged in again
+                if self.login_count == login_count:
+                    self.reauth_count += 1
+                    _LOGGER.debug(
+                        "Session expired (%s), re-authenticating; %s re-logins over %s requests",
+                        error,
+                        self.reauth_count,
+                        self.request_count,
+                    )
+                    await self.async_login()
+            return await self._async_send(method, path, **kwargs)
+
+    @asynccontextmanager
+    async def _async_request_slot(self):
+        """Hold a scheduler slot for one request and report its outcome to the circuit breaker."""
+        breaker = self.scheduler.circuit_breaker
+        if not breaker.allow_request():
+            raise SensusAnalyticsHostUnavailable(self.scheduler.host, breaker.retry_after)
+        healthy = None
+        try:
+            async with self.scheduler.async_slot():
+                yield
+            healthy = True
+        except Exception as error:
+            healthy = not is_transient(error)
+            raise
+        finally:
+            breaker.record(healthy)
+
+    async def _async_send(self, method, path, stream, **kwargs):
+        """Send a single request on the current session, decoding the body as it arrives.
+
+        stream holds the array path, item callback and previous version for _async_decode_stream.
+        """
+        url = urljoin(self.base_url, path)
+        async with self._async_request_slot():
+            self.request_count += 1
+            async with self._get_session().request(
+                method, url, allow_redirects=False, timeout=REQUEST_TIMEOUT, **kwargs
+            ) as response:
+                if response.status in REDIRECT_STATUSES:
+                    raise SensusAnalyticsSessionExpired(f"redirected to {response.headers.get('Location')}")
+                if response.status in (401, 403):
+                    raise SensusAnalyticsSessionExpired(f"status {response.status}")
+                response.raise_for_status()
+                if response.status == 304 and stream[2] is not None:
+                    record_unchanged(path.split("/")[1])
+                    return None, stream[2]
+                return await self._async_decode_stream(path, response, *stream)
+
+    @staticmethod
+    async def _async_decode_stream(path, response: aiohttp.ClientResponse, array_path, on_item, previous):
+        """Decode a response body chunk by chunk, handing the elements of array_path to on_item."""
+        decoder = JsonStreamDecoder(response.content.iter_chunked(STREAM_CHUNK_SIZE), array_path, on_item)
+        try:
+            with record_phase("stream_decode"):
+                document = await decoder.async_decode()
+        except ValueError as error:
+            if decoder.item_count:
+                # Elements were already handed out, so this can't be retried as an expired session
+                raise SensusAnalyticsError(f"malformed response: {error}") from error
+            # The portal answers with its HTML login page once the session is gone
+            raise SensusAnalyticsSessionExpired("response was not JSON") from error
+        finally:
+            # Name the size after the endpoint, e.g. "widget" or "usage"
+            record_size(path.split("/")[1], decoder.size)
+        if previous is not None and decoder.fingerprint == previous.fingerprint:
+            record_unchanged(path.split("/")[1])
+            return document, previous
+        version = PayloadVersion(
+            decoder.fingerprint, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        return document, version
+
+
+class SensusAnalyticsAccountClient:  # pylint: disable=too-many-instance-attributes
+    """Portal client shared by every meter configured under one login.
+
+    All meters of the login share one session, so the portal sees a single
+    login. When several meters of the same account are configured, the
+    ``water/widget/byPage`` request is made for the whole account and the
+    response, which lists every device, is shared between those meters for a
+    short window. Each meter's coordinator picks out its own device from it.
+    """
+
+    def __init__(self, hass: HomeAssistant, base_url, username, password):
+        """Initialize the account client."""
+        self.session = SensusAnalyticsSession(
+            hass, base_url, username, password, async_get_host_scheduler(hass, base_url)
+        )
+        self._meters: dict[str, set[str]] = {}
+        self._widget_cache: dict[str, tuple[float, tuple[list[dict], PayloadVersion]]] = {}
+        # Last devices and version per widget request, returned again while the response is unchanged
+        self._widget_payloads: dict[tuple[str, str | None], tuple[list[dict], PayloadVersion]] = {}
+        self._widget_requests: dict[str, asyncio.Future] = {}
+        self.widget_request_count = 0
+        self.widget_shared_count = 0
+        self.release_timer: CALLBACK_TYPE | None = None
+
+    @property
+    def meter_count(self):
+        """Return the number of meters using this client."""
+        return sum(len(meters) for meters in self._meters.values())
+
+    def register_meter(self, account_number, meter_number):
+        """Register a meter as a user of this client."""
+        self._meters.setdefault(account_number, set()).add(meter_number)
+
+    def unregister_meter(self, account_number, meter_number):
+        """Remove a meter from the users of this client."""
+        meters = self._meters.get(account_number, set())
+        meters.discard(meter_number)
+        self._widget_payloads.pop((account_number, meter_number), None)
+        if not meters:
+            self._meters.pop(account_number, None)
+            self._widget_cache.pop(account_number, None)
+            self._widget_payloads.pop((account_number, None), None)
+
+    async def async_fetch_device(self, account_number, meter_number):
+        """Return the widget device payload for one meter and the PayloadVersion of its response.
+
+        The version is the same object for as long as the response doesn't change.
+        """
+        if len(self._meters.get(account_number, ())) <= 1:
+            devices, version = await self._async_request_widget(account_number, meter_number)
+            return dict(devices[0]), version
+
+        devices, version = await self._async_fetch_account_widget(account_number)
+        for device in devices:
+            if any(str(device.get(field)) == str(meter_number) for field in DEVICE_ID_FIELDS):
+                return dict(device), version
+        if len(devices) == 1 and all(devices[0].get(field) in (None, "") for field in DEVICE_ID_FIELDS):
+            # A lone device that doesn't say which meter it is can only be this one
+            return dict(devices[0]), version
+        # The account response doesn't identify this meter; ask for it directly
+        _LOGGER.debug("Meter %s not found in the account widget, requesting it directly", meter_number)
+        devices, version = await self._async_request_widget(account_number, meter_number)
+        return dict(devices[0]), version
+
+    async def _async_fetch_account_widget(self, account_number):
+        """Return the devices and version of the account-wide widget, sharing recent and in-flight requests."""
+        cached = self._widget_cache.get(account_number)
+        if cached is not None and time.monotonic() - cached[0] < WIDGET_SHARE_WINDOW:
+            self.widget_shared_count += 1
+            return cached[1]
+        while (pending := self._widget_requests.get(account_number)) is not None:
+            if (widget := await asyncio.shield(pending)) is not None:
+                self.widget_shared_count += 1
+                return widget
+            # The meter making the request was cancelled; make it here instead
+
+        future = asyncio.get_running_loop().create_future()
+        self._widget_requests[account_number] = future
+        try:
+            widget = await self._async_request_widget(account_number, None)
+        except asyncio.CancelledError:
+            # Only this meter's refresh was cancelled, not those waiting on the request
+            future.set_result(None)
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            # Mark the exception retrieved in case no other meter is waiting on it
+            future.exception()
+            raise
+        finally:
+            self._widget_requests.pop(account_number, None)
+        future.set_result(widget)
+        self._widget_cache[account_number] = (time.monotonic(), widget)
+        return widget
+
+    async def _async_request_widget(self, account_number, meter_number):
+        """Request the widget devices and version for an account, optionally for a single meter."""
+        request = {"group": "meters", "accountNumber": account_number}
+        if meter_number is not None:
+            request["deviceId"] = meter_number
+        self.widget_request_count += 1
+        previous = self._widget_payloads.get((account_number, meter_number))
+        devices = []
+        _, version = await self.session.async_post_json_stream(
+            "water/widget/byPage",
+            request,
+            WIDGET_DEVICES_PATH,
+            devices.append,
+            previous=previous[1] if previous else None,
+        )
+        if previous is not None and version is previous[1]:
+            _LOGGER.debug("Widget response for account %s unchanged", account_number)
+            return previous
+        _LOGGER.debug("Widget response for account %s: %s devices", account_number, len(devices))
+        self._widget_payloads[(account_number, meter_number)] = (devices, version)
+        return devices, version
+
+
+def _conditional_headers(previous: PayloadVersion | None):
+    """Return the headers that make a request conditional on an earlier response's validators."""
+    headers = {}
+    if previous is not None and previous.etag:
+        headers["If-None-Match"] = previous.etag
+    if previous is not None and previous.last_modified:
+        headers["If-Modified-Since"] = previous.last_modified
+    return headers or None
+
+
+def _is_login_error(response: aiohttp.ClientResponse):
+    """Return True if a login response redirects to the page reporting rejected credentials."""
+    if response.status not in REDIRECT_STATUSES:
+        return False
+    query = parse_qs(urlsplit(response.headers.get("Location", "")).query, keep_blank_values=True)
+    return any(parameter in query for parameter in LOGIN_ERROR_PARAMETERS)
+
+
+@callback
+def async_get_account_client(hass: HomeAssistant, base_url, username, password) -> SensusAnalyticsAccountClient:
+    """Return the shared client for a login, creating it if needed."""
+    clients = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ACCOUNT_CLIENTS, {})
+    client = clients.get((base_url, username))
+    if client is None:
+        client = clients[(base_url, username)] = SensusAnalyticsAccountClient(hass, base_url, username, password)
+    else:
+        client.session.set_password(password)
+    return client
+
+
+async def async_validate_account_client(hass: HomeAssistant, base_url, username, password):
+    """Log in with the given credentials and keep the session for the entry created from them.
+
+    The login is made on the shared client for the credentials, so the entry
+    set up next finds it already logged in. A client that no meter uses yet is
+    closed if no entry claims it in time. Raises SensusAnalyticsAuthError if
+    the portal rejects the credentials.
+    """
+    clients = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ACCOUNT_CLIENTS, {})
+    client = clients.get((base_url, username))
+    if client is not None and client.meter_count and not client.session.uses_password(password):
+        # Check a changed password on a separate session, so a typo can't break
+        # the meters already using this login
+        session = SensusAnalyticsSession(hass, base_url, username, password, client.session.scheduler)
+        try:
+            await session.async_login()
+        finally:
+            await session.async_close()
+        client.session.set_password(password)
+        return client
+
+    client = async_get_account_client(hass, base_url, username, password)
+    try:
+        await client.session.async_ensure_login()
+    finally:
+        if not client.meter_count:
+            async_release_account_client(hass, client)
+    return client
+
+
+@callback
+def async_release_account_client(hass: HomeAssistant, client: SensusAnalyticsAccountClient):
+    """Close and forget a shared client once no meter has used it for a while."""
+    if client.meter_count:
+        return
+    if client.release_timer is not None:
+        client.release_timer()
+
+    async def _async_close_unclaimed(_now):
+        client.release_timer = None
+        if client.meter_count:
+            return
+        clients = hass.data.get(DOMAIN, {}).get(DATA_ACCOUNT_CLIENTS, {})
+        key = (client.session.base_url, client.session.username)
+        if clients.get(key) is client:
+            del clients[key]
+        await client.session.async_close()
+
+    client.release_timer = async_call_later(hass, UNCLAIMED_CLIENT_TIMEOUT, _async_close_unclaimed)
@@ -0,0 +1,232 @@
+"""Memory-mapped archive of hourly Sensus Analytics usage."""
+
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import shutil
+import struct
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from .hourly import HourlySeries
+
+_LOGGER = logging.getLogger(__name__)
+
+# Magic, format version, usage unit and the epoch hour (hours since 1970-01-01 UTC) of the first record
+HEADER = struct.Struct("<4sH2x8sq")
+MAGIC = b"SNSA"
+VERSION = 1
+# One little-endian double per hour; the header size keeps the records 8-byte aligned
+RECORD = struct.Struct("<d")
+MISSING = RECORD.pack(math.nan)
+HOUR_MS = 3_600_000
+# Records copied at a time when the file is rewritten with an earlier epoch
+COPY_CHUNK = 1 << 20
+
+
+class HourlyArchive:
+    """Append-only file holding one fixed-width usage record per hour for a meter.
+
+    Record n describes the hour ``epoch + n``, so an hour's record is found
+    by its offset from the epoch without an index. NaN marks an hour
+    without a reading. Known values are only ever added: new hours extend
+    the file, hours that arrive late fill their slot in place, and an hour
+    before the epoch rewrites the file once with an earlier epoch. Queries
+    map the file read-only and touch only the records they need, so they
+    run in constant memory however many years the file holds.
+
+    The blocking methods run in the executor through their async wrappers.
+    """
+
+    def __init__(self, hass: HomeAssistant, path):
+        """Initialize the archive; the file is created by the first append."""
+        self.hass = hass
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    async def async_append(self, series: HourlySeries):
+        """Add the known readings of an hourly series to the archive."""
+        return await self.hass.async_add_executor_job(self.append, series)
+
+    async def async_total_usage(self, start_ts, end_ts):
+        """Return the usage total and the number of known hours between two timestamps."""
+        return await self.hass.async_add_executor_job(self.total_usage, start_ts, end_ts)
+
+    async def async_rolling_sums(self, start_ts, end_ts, window_hours):
+        """Return the usage over the trailing window at every hour between two timestamps."""
+        return await self.hass.async_add_executor_job(self.rolling_sums, start_ts, end_ts, window_hours)
+
+    async def async_info(self):
+        """Return the archive layout for diagnostics."""
+        return await self.hass.async_add_executor_job(self.info)
+
+    async def async_remove(self):
+        """Delete the archive file."""
+        await self.hass.async_add_executor_job(self.remove)
+
+    def append(self, series: HourlySeries):
+        """Write the known readings of a series and return how many were written."""
+        readings = [
+            (timestamp // HOUR_MS, value)
+            for timestamp, value in zip(series.timestamps, series.usage)
+            if not math.isnan(value)
+        ]
+        if not readings:
+            return 0
+        first_hour = min(hour for hour, _ in readings)
+        last_hour = max(hour for hour, _ in readings)
+
+        with self._lock:
+            header = self._read_header()
+            if header is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "wb") as file:
+                    file.write(HEADER.pack(MAGIC, VERSION, _encode_unit(series.usage_unit), first_hour))
+                unit, epoch = series.usage_unit, first_hour
+            else:
+                unit, epoch = header
+                if unit != series.usage_unit:
+                    _LOGGER.warning(
+                        "Not archiving usage in %s to %s, which holds usage in %s", series.usage_unit, self.path, unit
+                    )
+                    return 0
+                if first_hour < epoch:
+                    self._rebase(epoch, first_hour)
+                    epoch = first_hour
+
+            with open(self.path, "r+b") as file:
+                end = (file.seek(0, os.SEEK_END) - HEADER.size) // RECORD.size
+                if last_hour - epoch >= end:
+                    # Pad the hours between the last record and the new ones as missing
+                    file.seek(HEADER.size + end * RECORD.size)
+                    file.write(MISSING * (last_hour - epoch + 1 - end))
+                for hour, value in readings:
+                    file.seek(HEADER.size + (hour - epoch) * RECORD.size)
+                    file.write(RECORD.pack(value))
+        return len(readings)
+
+    def total_usage(self, start_ts, end_ts):
+        """Return (total, known hours) for the hours starting in [start_ts, end_ts)."""
+        with self._records() as (epoch, records):
+            first, last = self._clip(epoch, records, start_ts, end_ts)
+            with records[first:last] as window:
+                total = math.fsum(value for value in window if not math.isnan(value))
+                return total, sum(not math.isnan(value) for value in window)
+
+    def rolling_sums(self, start_ts, end_ts, window_hours):
+        """Return (hour timestamp, total) for each hour starting in [start_ts, end_ts).
+
+        Each total covers that hour and the ``window_hours - 1`` hours before
+        it, and is None when none of them has a reading. The window is slid
+        one record at a time rather than summed again for every hour.
+        """
+        start_hour, end_hour = -(-start_ts // HOUR_MS), -(-end_ts // HOUR_MS)
+        results = []
+        with self._records() as (epoch, records):
+            if not records:
+                return results
+
+            def value_at(hour):
+                position = hour - epoch
+                if 0 <= position < len(records) and not math.isnan(records[position]):
+                    return records[position]
+                return None
+
+            # Start early enough for the first window to be full, without reporting those hours
+            first_hour = start_hour - window_hours + 1
+            total, known = 0.0, 0
+            for hour in range(first_hour, end_hour):
+                if (value := value_at(hour)) is not None:
+                    total += value
+                    known += 1
+                # Drop the hour that left the window; only hours since the first were ever added
+                if hour - window_hours >= first_hour and (value := value_at(hour - window_hours)) is not None:
+                    total -= value
+                    known -= 1
+                if hour >= start_hour:
+                    results.append((hour * HOUR_MS, total if known else None))
+        return results
+
+    def info(self):
+        """Return the unit, the first hour and the number of hours held."""
+        with self._records() as (epoch, records):
+            if not records:
+                return {"hours": 0}
+            return {
+                "unit": self._read_header()[0],
+                "first_hour": epoch * HOUR_MS,
+                "hours": len(records),
+                "size": self.path.stat().st_size,
+            }
+
+    def remove(self):
+        """Delete the archive file if it exists."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+    @contextmanager
+    def _records(self) -> Iterator[tuple[int, memoryview]]:
+        """Map the file read-only and yield its epoch and a view of its records, empty without an archive."""
+        with self._lock:
+            header = self._read_header()
+            if header is None or self.path.stat().st_size <= HEADER.size:
+                yield 0, memoryview(b"").cast("d")
+                return
+            with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                count = (len(mapped) - HEADER.size) // RECORD.size
+                records = memoryview(mapped)[HEADER.size : HEADER.size + count * RECORD.size].cast("d")
+                try:
+                    yield header[1], records
+                finally:
+                    # The map can only be closed once no view of it is left
+                    records.release()
+
+    @staticmethod
+    def _clip(epoch, records, start_ts, end_ts):
+        """Return the record positions of the hours starting in [start_ts, end_ts)."""
+        first = min(max(-(-start_ts // HOUR_MS) - epoch, 0), len(records))
+        last = min(max(-(-end_ts // HOUR_MS) - epoch, first), len(records))
+        return first, last
+
+    def _read_header(self):
+        """Return (unit, epoch hour) from the header, or None if there is no archive yet.
+
+        Raises ValueError if the file is not an archive or its header is cut short.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                raw = file.read(HEADER.size)
+        except FileNotFoundError:
+            return None
+        if not raw:
+            return None
+        if len(raw) != HEADER.size:
+            raise ValueError(f"{self.path} is truncated")
+        magic, version, unit, epoch = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} usage archive")
+        return unit.rstrip(b"\0").decode() or None, epoch
+
+    def _rebase(self, epoch, new_epoch):
+        """Rewrite the file so that it starts at the earlier new_epoch."""
+        _LOGGER.debug("Moving the start of %s back by %s hours", self.path, epoch - new_epoch)
+        temporary = self.path.with_suffix(".tmp")
+        with open(self.path, "rb") as source, open(temporary, "wb") as target:
+            header = bytearray(source.read(HEADER.size))
+            struct.pack_into("<q", header, HEADER.size - 8, new_epoch)
+            target.write(header)
+            target.write(MISSING * (epoch - new_epoch))
+            shutil.copyfileobj(source, target, COPY_CHUNK)
+        os.replace(temporary, self.path)
+
+
+def _encode_unit(unit):
+    """Return a unit name as the fixed-width header field."""
+    return (unit or "").encode()[:8]
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
+from typing import Any
 
 import aiohttp
 import voluptuous as vol
@@ -11,10 +13,53 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 
-from .const import CONF_ACCOUNT_NUMBER, CONF_BASE_URL, CONF_METER_NUMBER, CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from .api import SensusAnalyticsAuthError, SensusAnalyticsError, async_validate_account_client
+from .const import (
+    CONF_ACCOUNT_NUMBER,
+    CONF_BACKFILL_DAYS,
+    CONF_BASE_URL,
+    CONF_HOST_MAX_CONCURRENCY,
+    CONF_HOST_REQUEST_RATE,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_METER_NUMBER,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DEFAULT_BACKFILL_DAYS,
+    DEFAULT_HOST_MAX_CONCURRENCY,
+    DEFAULT_HOST_REQUEST_RATE,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Counts and intervals where 0 would stop polling or importing altogether
+POSITIVE_INT = vol.All(vol.Coerce(int), vol.Range(min=1))
+
+
+async def _async_test_credentials(hass, user_input) -> bool:
+    """Log in with the provided credentials, keeping the session for the entry that uses them."""
+    try:
+        await async_validate_account_client(
+            hass, user_input[CONF_BASE_URL], user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+        )
+    except SensusAnalyticsAuthError:
+        _LOGGER.debug("The portal rejected the credentials")
+        return False
+    except (SensusAnalyticsError, aiohttp.ClientError, TimeoutError) as error:
+        _LOGGER.error("Error validating credentials: %s", error)
+        return False
+    return True
+
+
+def _validate_poll_intervals(user_input) -> dict[str, str]:
+    """Return the form errors for poll interval bounds that can't both hold."""
+    if user_input[CONF_MAX_POLL_INTERVAL] < user_input[CONF_MIN_POLL_INTERVAL]:
+        return {CONF_MAX_POLL_INTERVAL: "max_poll_interval_below_min"}
+    return {}
+
 
 class SensusAnalyticsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Sensus Analytics Integration."""
@@ -37,11 +82,13 @@ class SensusAnalyticsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
 
+            errors = _validate_poll_intervals(user_input)
             # Validate the user input (e.g., test the connection)
-            valid = await self._test_credentials(user_input)
-            if valid:
-                return self.async_create_entry(title="Sensus Analytics", data=user_input)
-            errors["base"] = "auth"
+            if not errors:
+                valid = await self._test_credentials(user_input)
+                if valid:
+                    return self.async_create_entry(title="Sensus Analytics", data=user_input)
+                errors["base"] = "auth"
 
         data_schema = vol.Schema(
             {
@@ -57,28 +104,42 @@ class SensusAnalyticsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional("tier2_price"): cv.positive_float,
                 vol.Optional("tier3_price"): cv.positive_float,
                 vol.Required("service_fee", default=15.00): cv.positive_float,
+                vol.Required(CONF_MIN_POLL_INTERVAL, default=DEFAULT_MIN_POLL_INTERVAL): POSITIVE_INT,
+                vol.Required(CONF_MAX_POLL_INTERVAL, default=DEFAULT_MAX_POLL_INTERVAL): POSITIVE_INT,
+                vol.Required(CONF_BACKFILL_DAYS, default=DEFAULT_BACKFILL_DAYS): POSITIVE_INT,
+                vol.Required(CONF_HOST_REQUEST_RATE, default=DEFAULT_HOST_REQUEST_RATE): POSITIVE_INT,
+                vol.Required(CONF_HOST_MAX_CONCURRENCY, default=DEFAULT_HOST_MAX_CONCURRENCY): POSITIVE_INT,
             }
         )
         return self.async_show_form(step_id="user", data_schema=data_schema, errors=errors)
 
+    async def async_step_reauth(self, _entry_data: Mapping[str, Any]) -> FlowResult:
+        """Handle a rejected password reported by the coordinator."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None) -> FlowResult:
+        """Ask for the new password and reload the entry with it."""
+        errors = {}
+        reauth_entry = self._get_reauth_entry()
+
+        if user_input is not None:
+            data = {**reauth_entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+            if await self._test_credentials(data):
+                return self.async_update_reload_and_abort(
+                    reauth_entry, data_updates={CONF_PASSWORD: user_input[CONF_PASSWORD]}
+                )
+            errors["base"] = "auth"
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            errors=errors,
+            description_placeholders={"username": reauth_entry.data[CONF_USERNAME]},
+        )
+
     async def _test_credentials(self, user_input) -> bool:
         """Test if the provided credentials are valid."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{user_input[CONF_BASE_URL]}/j_spring_security_check",
-                    data={
-                        "j_username": user_input[CONF_USERNAME],
-                        "j_password": user_input[CONF_PASSWORD],
-                    },
-                    allow_redirects=False,
-                    timeout=10,
-                ) as response:
-                    _LOGGER.debug("Authentication response status: %s", response.status)
-                    return response.status == 302
-        except aiohttp.ClientError as error:
-            _LOGGER.error("Error validating credentials: %s", error)
-            return False
+        return await _async_test_credentials(self.hass, user_input)
 
     @staticmethod
     @callback
@@ -92,14 +153,22 @@ class SensusAnalyticsOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the options."""
+        errors = {}
         if user_input is not None:
             _LOGGER.debug("User updated options: %s", user_input)
-            # Update the entry with new options
-            self.hass.config_entries.async_update_entry(self.config_entry, data=user_input)
-            # Force a sensor refresh
-            coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]
-            await coordinator.async_request_refresh()
-            return self.async_create_entry(title="", data={})
+            errors = _validate_poll_intervals(user_input)
+            # Validated on the shared session, which is already logged in unless the credentials changed
+            if not errors:
+                if await _async_test_credentials(self.hass, user_input):
+                    # Update the entry with new options
+                    self.hass.config_entries.async_update_entry(self.config_entry, data=user_input)
+                    coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]
+                    # A new login or meter reloads the entry from its update listener;
+                    # otherwise force a sensor refresh, ahead of the background polls of other entries
+                    if not coordinator.identity_changed():
+                        await coordinator.async_request_interactive_refresh()
+                    return self.async_create_entry(title="", data={})
+                errors["base"] = "auth"
 
         # Fetch current configuration data
         current_data = self.config_entry.data
@@ -154,7 +223,27 @@ class SensusAnalyticsOptionsFlow(config_entries.OptionsFlow):
                     "service_fee",
                     default=current_data.get("service_fee", 15.00),
                 ): cv.positive_float,
+                vol.Required(
+                    CONF_MIN_POLL_INTERVAL,
+                    default=current_data.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL),
+                ): POSITIVE_INT,
+                vol.Required(
+                    CONF_MAX_POLL_INTERVAL,
+                    default=current_data.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+                ): POSITIVE_INT,
+                vol.Required(
+                    CONF_BACKFILL_DAYS,
+                    default=current_data.get(CONF_BACKFILL_DAYS, DEFAULT_BACKFILL_DAYS),
+                ): POSITIVE_INT,
+                vol.Required(
+                    CONF_HOST_REQUEST_RATE,
+                    default=current_data.get(CONF_HOST_REQUEST_RATE, DEFAULT_HOST_REQUEST_RATE),
+                ): POSITIVE_INT,
+                vol.Required(
+                    CONF_HOST_MAX_CONCURRENCY,
+                    default=current_data.get(CONF_HOST_MAX_CONCURRENCY, DEFAULT_HOST_MAX_CONCURRENCY),
+                ): POSITIVE_INT,
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(step_id="init", data_schema=data_schema, errors=errors)
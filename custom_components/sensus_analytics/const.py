@@ -2,10 +2,43 @@
 
 DOMAIN = "sensus_analytics"
 
+# hass.data[DOMAIN] key holding the account clients shared between entries
+DATA_ACCOUNT_CLIENTS = "account_clients"
+# hass.data[DOMAIN] key holding the request schedulers shared by entries on one host
+DATA_HOST_SCHEDULERS = "host_schedulers"
+
 CONF_BASE_URL = "base_url"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"  # nosec
 CONF_ACCOUNT_NUMBER = "account_number"
 CONF_METER_NUMBER = "meter_number"
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+CONF_BACKFILL_DAYS = "backfill_days"
+CONF_HOST_REQUEST_RATE = "host_request_rate"
+CONF_HOST_MAX_CONCURRENCY = "host_max_concurrency"
 
 DEFAULT_NAME = "Sensus Analytics"
+
+DEFAULT_MIN_POLL_INTERVAL = 5  # minutes
+DEFAULT_MAX_POLL_INTERVAL = 60  # minutes
+DEFAULT_BACKFILL_DAYS = 30
+DEFAULT_HOST_REQUEST_RATE = 60  # requests per minute
+DEFAULT_HOST_MAX_CONCURRENCY = 4
+
+SERVICE_FETCH_RANGE = "fetch_range"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+DEFAULT_FETCH_RANGE_CONCURRENCY = 4
+
+SERVICE_GET_USAGE_HISTORY = "get_usage_history"
+ATTR_INTERVAL = "interval"
+INTERVAL_DAY = "day"
+INTERVAL_MONTH = "month"
+
+SERVICE_GET_ARCHIVED_USAGE = "get_archived_usage"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_WINDOW_HOURS = "window_hours"
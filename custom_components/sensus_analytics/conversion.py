@@ -0,0 +1,31 @@
+"""Unit conversion helpers for Sensus Analytics usage values."""
+
+CF_TO_GALLON = 7.48052
+CF_PER_CCF = 100  # 1 CCF = 100 cubic feet
+
+
+# pylint: disable=too-many-return-statements
+def convert_usage(usage, usage_unit, config_unit_type):
+    """Convert a usage value from the portal's unit to the configured unit type."""
+    if usage is None:
+        return None
+
+    try:
+        usage_float = float(usage)
+    except (ValueError, TypeError):
+        return None
+
+    # CF (cubic feet) conversions
+    if usage_unit == "CF" and config_unit_type == "gal":
+        return round(usage_float * CF_TO_GALLON)
+    if usage_unit == "CF" and config_unit_type == "CCF":
+        return round(usage_float / CF_PER_CCF, 2)
+
+    # GAL (gallons) conversions
+    if usage_unit == "GAL" and config_unit_type == "gal":
+        return usage
+    if usage_unit == "GAL" and config_unit_type == "CCF":
+        # Convert gallons to cubic feet, then to CCF
+        return round(usage_float / CF_TO_GALLON / CF_PER_CCF, 2)
+
+    return usage
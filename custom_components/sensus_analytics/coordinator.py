@@ -1,20 +1,97 @@
 """DataUpdateCoordinator for Sensus Analytics Integration."""
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from urllib.parse import urljoin
-
-import requests
-from homeassistant.core import HomeAssistant
+import random
+from collections import deque
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
-
-from .const import CONF_ACCOUNT_NUMBER, CONF_BASE_URL, CONF_METER_NUMBER, CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from homeassistant.util import slugify
+
+from .api import (
+    PayloadVersion,
+    SensusAnalyticsAuthError,
+    SensusAnalyticsError,
+    SensusAnalyticsHostUnavailable,
+    async_get_account_client,
+    async_release_account_client,
+)
+from .archive import HourlyArchive
+from .const import (
+    CONF_ACCOUNT_NUMBER,
+    CONF_BASE_URL,
+    CONF_HOST_MAX_CONCURRENCY,
+    CONF_HOST_REQUEST_RATE,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_METER_NUMBER,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DEFAULT_HOST_MAX_CONCURRENCY,
+    DEFAULT_HOST_REQUEST_RATE,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+)
+from .derived import METADATA_FIELDS, SensusAnalyticsDerivedData, SensusAnalyticsMetadata, build_derived_data
+from .hourly import HourlySeries, HourlySeriesBuilder
+from .metrics import CURRENT_METRICS, RefreshMetrics, record_phase
+from .polling import AdaptivePollScheduler
+from .resilience import async_retry
+from .scheduler import PRIORITY_INTERACTIVE, PRIORITY_POLL, REQUEST_PRIORITY
+from .statistics import SensusAnalyticsStatisticsImporter
+from .tariff import Tariff
 
 _LOGGER = logging.getLogger(__name__)
 
+DAILY_FETCH_TIMEOUT = 30
+HOURLY_FETCH_TIMEOUT = 30
+# Overall time a refresh may take, retries included
+REFRESH_DEADLINE = 90
+
+# Incomplete days are polled again at most this often
+HOURLY_PARTIAL_REFRESH = timedelta(hours=1)
+# Number of days of hourly data kept in the per-date cache
+HOURLY_CACHE_DAYS = 3
+
+# Portal zoom levels, each returning one point per interval for a window of up to one:
+ZOOM_DAY = "day"  # hourly points for a day
+ZOOM_MONTH = "month"  # daily points for a month
+ZOOM_YEAR = "year"  # monthly points for a year
+# Path of the rows inside a usage response
+USAGE_ROWS_PATH = ("data", "usage")
+
+SNAPSHOT_STORAGE_VERSION = 1
+# Delay before a refreshed snapshot is written, so bursts of refreshes write once
+SNAPSHOT_SAVE_DELAY = 30
+# How long the last good data is served while the portal cannot be reached
+STALE_DATA_MAX_AGE = timedelta(days=1)
+# How often the static meter metadata is taken from the widget response
+METADATA_REFRESH_INTERVAL = timedelta(days=1)
+# Window over which the first refreshes after a restart are spread when data was restored
+STARTUP_SPREAD = timedelta(minutes=1)
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the last good data of a config entry."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
 
-class SensusAnalyticsDataUpdateCoordinator(DataUpdateCoordinator):
+def usage_archive(hass: HomeAssistant, account_number, meter_number) -> HourlyArchive:
+    """Return the hourly usage archive of a meter."""
+    return HourlyArchive(
+        hass, hass.config.path(STORAGE_DIR, DOMAIN, f"{slugify(f'{account_number}_{meter_number}')}.archive")
+    )
+
+
+class SensusAnalyticsDataUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-many-instance-attributes
     """Class to manage fetching data from the API."""
 
     def __init__(self, hass: HomeAssistant, config_entry):
@@ -26,113 +103,465 @@ class SensusAnalyticsDataUpdateCoordinator(DataUpdateCoordinator):
         self.account_number = config_entry.data[CONF_ACCOUNT_NUMBER]
         self.meter_number = config_entry.data[CONF_METER_NUMBER]
         self.config_entry = config_entry
+        self.client = async_get_account_client(hass, self.base_url, self.username, self.password)
+        self.client.register_meter(self.account_number, self.meter_number)
+        self._configure_scheduler()
+        self._interactive_refresh = False
+        self.tariff = Tariff.from_config(config_entry.data)
+        self.derived: SensusAnalyticsDerivedData | None = None
+        self.metadata: SensusAnalyticsMetadata | None = None
+        self.metadata_updated_at: datetime | None = None
+        self.metrics = RefreshMetrics()
+        self._hourly_cache: dict[date, HourlySeries] = {}
+        self._hourly_fetched_at: dict[date, datetime] = {}
+        # Versions of the last widget and usage responses, to recognize unchanged ones
+        self._widget_version: PayloadVersion | None = None
+        self._hourly_versions: dict[date, PayloadVersion] = {}
+        self._snapshot_store = snapshot_store(hass, config_entry.entry_id)
+        self.data_updated_at: datetime | None = None
+        self.poll_scheduler = AdaptivePollScheduler(
+            timedelta(minutes=config_entry.data.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)),
+            timedelta(minutes=config_entry.data.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)),
+        )
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=5),
+            update_interval=self.poll_scheduler.min_interval,
+        )
+        self.statistics_importer = SensusAnalyticsStatisticsImporter(hass, self)
+        self.archive = usage_archive(hass, self.account_number, self.meter_number)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled refresh and release the shared account client."""
+        await super().async_shutdown()
+        self.client.unregister_meter(self.account_number, self.meter_number)
+        async_release_account_client(self.hass, self.client)
+
+    @callback
+    def async_config_entry_updated(self):
+        """Recompile the settings derived from the config entry after it changed."""
+        self.tariff = Tariff.from_config(self.config_entry.data)
+        self._configure_scheduler()
+        if self.data is not None:
+            self.derived = build_derived_data(self.data, self.metadata, self.config_entry.data, self.tariff)
+            self.async_update_listeners()
+
+    def identity_changed(self):
+        """Return True if the entry now names another portal, login or meter than this coordinator uses."""
+        data = self.config_entry.data
+        return (self.base_url, self.username, self.password, self.account_number, self.meter_number) != (
+            data[CONF_BASE_URL],
+            data[CONF_USERNAME],
+            data[CONF_PASSWORD],
+            data[CONF_ACCOUNT_NUMBER],
+            data[CONF_METER_NUMBER],
         )
 
+    def _configure_scheduler(self):
+        """Apply the entry's rate and concurrency settings to the shared host scheduler."""
+        self.session.scheduler.configure(
+            self.config_entry.data.get(CONF_HOST_REQUEST_RATE, DEFAULT_HOST_REQUEST_RATE),
+            self.config_entry.data.get(CONF_HOST_MAX_CONCURRENCY, DEFAULT_HOST_MAX_CONCURRENCY),
+        )
+
+    async def async_request_interactive_refresh(self):
+        """Request a refresh whose requests go ahead of background polls on the host."""
+        self._interactive_refresh = True
+        await self.async_request_refresh()
+
+    async def async_spread_refresh(self):
+        """Refresh after a random delay, so entries restored together don't poll at once."""
+        await asyncio.sleep(random.uniform(0, STARTUP_SPREAD.total_seconds()))
+        await self.async_refresh()
+
+    @property
+    def session(self):
+        """Return the portal session shared with the other meters of this login."""
+        return self.client.session
+
     async def _async_update_data(self):
         """Fetch data from API."""
         _LOGGER.debug("Async update of data started")
-        return await self.hass.async_add_executor_job(self._fetch_data)
-
-    def _fetch_data(self):
-        """Fetch data from the Sensus Analytics API."""
-        _LOGGER.debug("Starting data fetch from Sensus Analytics API")
+        token = CURRENT_METRICS.set(self.metrics)
+        priority_token = REQUEST_PRIORITY.set(PRIORITY_INTERACTIVE if self._interactive_refresh else PRIORITY_POLL)
+        self._interactive_refresh = False
         try:
-            session = self._create_authenticated_session()
-
-            # Fetch daily data
-            data = self._fetch_daily_data(session)
+            with self.metrics.phase("refresh"):
+                data = await self._async_fetch_data()
+                self.data_updated_at = dt_util.utcnow()
+                if data is self.data:
+                    # Neither response changed: keep publishing the same objects
+                    self.metrics.record_unchanged("refresh")
+                    if not self.derived.is_current(dt_util.now()):
+                        self.derived = build_derived_data(data, self.metadata, self.config_entry.data, self.tariff)
+                else:
+                    with self.metrics.phase("post_processing"):
+                        data = self._merge_metadata(data, self.data_updated_at)
+                        self.derived = build_derived_data(data, self.metadata, self.config_entry.data, self.tariff)
+        finally:
+            REQUEST_PRIORITY.reset(priority_token)
+            CURRENT_METRICS.reset(token)
+        # pylint: disable-next=attribute-defined-outside-init
+        self.update_interval = self.poll_scheduler.observe(self.derived.last_read, self.data_updated_at)
+        self._snapshot_store.async_delay_save(self._snapshot_to_storage, SNAPSHOT_SAVE_DELAY)
+        return data
 
-            # Fetch hourly data
-            _LOGGER.debug("Fetching hourly data")
-            local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-            now_local = datetime.now(local_tz)
-            target_date = now_local - timedelta(days=1)
-            hourly_data = self._retrieve_hourly_data(session, target_date)
-            if hourly_data:
-                data["hourly_usage_data"] = hourly_data
-            else:
-                _LOGGER.warning("Failed to fetch hourly data")
+    @callback
+    def async_hourly_tick(self, _now: datetime):
+        """Rebuild the time-dependent values at the top of the hour, independent of polling."""
+        if self.data is None or self.derived is None or self.derived.is_current(dt_util.now()):
+            return
+        self.derived = build_derived_data(self.data, self.metadata, self.config_entry.data, self.tariff)
+        self.async_update_listeners()
+
+    @property
+    def has_fresh_data(self):
+        """Return True if the last good data is recent enough to keep serving."""
+        return (
+            self.data is not None
+            and self.data_updated_at is not None
+            and dt_util.utcnow() - self.data_updated_at < STALE_DATA_MAX_AGE
+        )
 
+    async def async_restore_snapshot(self):
+        """Load the last persisted payload as the current data; return True if one was found."""
+        stored = await self._snapshot_store.async_load()
+        if not stored:
+            return False
+        if (stored.get("account_number"), stored.get("meter_number")) != (self.account_number, self.meter_number):
+            # The entry was reconfigured for another meter since the snapshot was written
+            _LOGGER.debug("Discarding the snapshot of another meter")
+            return False
+        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
+        for iso_date, cached in stored.get("hourly_cache", {}).items():
+            series = HourlySeries.from_dict(cached["series"])
+            series.build_index(local_tz)
+            target_date = date.fromisoformat(iso_date)
+            self._hourly_cache[target_date] = series
+            self._hourly_fetched_at[target_date] = datetime.fromisoformat(cached["fetched_at"])
+        data = dict(stored["data"])
+        hourly_date = data.pop("hourly_usage_date", None)
+        if hourly_date is not None and date.fromisoformat(hourly_date) in self._hourly_cache:
+            data["hourly_usage_data"] = self._hourly_cache[date.fromisoformat(hourly_date)]
+        # pylint: disable-next=attribute-defined-outside-init
+        self.data = data
+        self.metadata = SensusAnalyticsMetadata.from_device(data)
+        self.metadata_updated_at = datetime.fromisoformat(stored.get("metadata_updated_at", stored["updated_at"]))
+        self.derived = build_derived_data(data, self.metadata, self.config_entry.data, self.tariff)
+        self.data_updated_at = datetime.fromisoformat(stored["updated_at"])
+        _LOGGER.debug("Restored data from %s", self.data_updated_at)
+        return True
+
+    def _merge_metadata(self, data, now: datetime):
+        """Combine the volatile fields of a device payload with the cached metadata.
+
+        The metadata fields are only taken from the payload when the slow tier is
+        due; otherwise the cached values are published unchanged.
+        """
+        if self.metadata is None or now - self.metadata_updated_at >= METADATA_REFRESH_INTERVAL:
+            _LOGGER.debug("Refreshing meter metadata")
+            self.metadata = SensusAnalyticsMetadata.from_device(data)
+            self.metadata_updated_at = now
             return data
+        volatile = {key: value for key, value in data.items() if key not in METADATA_FIELDS}
+        return {**{field: self.data.get(field) for field in METADATA_FIELDS}, **volatile}
+
+    def _snapshot_to_storage(self):
+        """Return the current data and hourly cache in a JSON-serializable form."""
+        data = {key: value for key, value in self.data.items() if key != "hourly_usage_data"}
+        for cached_date, series in self._hourly_cache.items():
+            if series is self.data.get("hourly_usage_data"):
+                data["hourly_usage_date"] = cached_date.isoformat()
+        return {
+            "account_number": self.account_number,
+            "meter_number": self.meter_number,
+            "updated_at": self.data_updated_at.isoformat(),
+            "metadata_updated_at": self.metadata_updated_at.isoformat(),
+            "data": data,
+            "hourly_cache": {
+                cached_date.isoformat(): {
+                    "series": series.as_dict(),
+                    "fetched_at": self._hourly_fetched_at[cached_date].isoformat(),
+                }
+                for cached_date, series in self._hourly_cache.items()
+            },
+        }
+
+    async def _async_fetch_data(self):
+        """Fetch data from the Sensus Analytics API."""
+        _LOGGER.debug("Starting data fetch from Sensus Analytics API")
+        try:
+            async with asyncio.timeout(REFRESH_DEADLINE):
+                return await self._async_fetch_all()
 
         except UpdateFailed as error:
             raise error
+        except SensusAnalyticsAuthError as error:
+            # Start the reauth flow instead of logging in with bad credentials on every poll
+            raise ConfigEntryAuthFailed("Authentication failed") from error
+        except SensusAnalyticsHostUnavailable as error:
+            # Don't poll again before the host's circuit lets a request through
+            if error.retry_after is not None:
+                # pylint: disable-next=attribute-defined-outside-init
+                self.update_interval = max(self.update_interval, error.retry_after)
+            raise UpdateFailed(str(error)) from error
+        except TimeoutError as error:
+            raise UpdateFailed(f"Refresh did not complete within {REFRESH_DEADLINE} seconds") from error
         except Exception as error:
             _LOGGER.error("Unexpected error: %s", error)
             raise UpdateFailed(f"Unexpected error: {error}") from error
 
-    def _create_authenticated_session(self):
-        """Create and return an authenticated session."""
-        session = requests.Session()
-        # Authenticate and get session cookie
-        login_url = urljoin(self.base_url, "j_spring_security_check")
-        _LOGGER.debug("Authentication URL: %s", login_url)
-        r_sec = session.post(
-            login_url,
-            data={"j_username": self.username, "j_password": self.password},
-            allow_redirects=False,
-            timeout=10,
-        )
-        # Check if login was successful
-        if r_sec.status_code != 302:
-            _LOGGER.error("Authentication failed with status code %s", r_sec.status_code)
-            raise UpdateFailed("Authentication failed")
-
-        _LOGGER.debug("Authentication successful")
-        return session
-
-    def _fetch_daily_data(self, session):
-        """Fetch daily meter data."""
-        widget_url = urljoin(self.base_url, "water/widget/byPage")
-        _LOGGER.debug("Widget URL: %s", widget_url)
-        response = session.post(
-            widget_url,
-            json={
-                "group": "meters",
-                "accountNumber": self.account_number,
-                "deviceId": self.meter_number,
-            },
-            timeout=10,
+    async def _async_fetch_all(self):
+        """Fetch the daily data, and the hourly data when it is due."""
+        # Log in up front so the concurrent requests below share one session;
+        # a login that failed transiently is retried like the fetches
+        await async_retry(self.session.async_ensure_login)
+
+        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
+        now_local = datetime.now(local_tz)
+        target_date = (now_local - timedelta(days=1)).date()
+
+        if self._hourly_fetch_due(target_date, now_local):
+            # Fetch daily and hourly data concurrently; the hourly request handles
+            # its own errors so it can never fail the daily snapshot
+            _LOGGER.debug("Fetching daily and hourly data")
+            daily, hourly_data = await asyncio.gather(
+                self._async_fetch_daily_data(),
+                self._async_retrieve_hourly_data(target_date),
+                return_exceptions=True,
+            )
+            if isinstance(daily, BaseException):
+                raise daily
+            if isinstance(hourly_data, BaseException):
+                # Handled below like any other failed hourly fetch
+                _LOGGER.error("Error fetching hourly data: %s", hourly_data)
+                hourly_data = None
+            if hourly_data:
+                self._cache_hourly_data(target_date, hourly_data, now_local)
+        else:
+            _LOGGER.debug("Hourly data for %s is cached, fetching daily data only", target_date)
+            daily = await self._async_fetch_daily_data()
+        data, widget_version = daily
+        hourly_data = self._hourly_cache.get(target_date)
+
+        published = self.data or {}
+        if (
+            self._widget_version is not None
+            and widget_version is self._widget_version
+            and published.get("hourly_usage_data") is (hourly_data or published.get("hourly_usage_data"))
+        ):
+            _LOGGER.debug("Responses unchanged, reusing the published data")
+            return self.data
+        self._widget_version = widget_version
+
+        if hourly_data:
+            data["hourly_usage_data"] = hourly_data
+        elif self.data and self.data.get("hourly_usage_data"):
+            _LOGGER.warning("Failed to fetch hourly data, keeping the previous hourly data")
+            data["hourly_usage_data"] = self.data["hourly_usage_data"]
+        else:
+            _LOGGER.warning("Failed to fetch hourly data")
+
+        _LOGGER.debug(
+            "Session stats: %s requests, %s logins, %s re-authentications",
+            self.session.request_count,
+            self.session.login_count,
+            self.session.reauth_count,
         )
-        response.raise_for_status()
-        data = response.json()
-        _LOGGER.debug("Raw response data: %s", data)
-        # Navigate to the specific data
-        data = data.get("widgetList")[0].get("data").get("devices")[0]
-        _LOGGER.debug("Parsed data: %s", data)
         return data
 
-    def _retrieve_hourly_data(self, session: requests.Session, target_date: datetime):
-        """Retrieve hourly usage data for a specific date based on local time."""
+    async def _async_fetch_daily_data(self):
+        """Fetch daily meter data and the version of its response, retrying transient failures."""
+        with record_phase("widget_fetch"):
+            data, version = await async_retry(self._async_fetch_device)
+        _LOGGER.debug("Widget device for meter %s with %s fields", self.meter_number, len(data))
+        return data, version
+
+    async def _async_fetch_device(self):
+        """Fetch the widget device payload and its version once."""
+        async with asyncio.timeout(DAILY_FETCH_TIMEOUT):
+            return await self.client.async_fetch_device(self.account_number, self.meter_number)
+
+    async def async_get_hourly_series(self, target_date: date):
+        """Return the hourly data for a date, from the cache when the day is final."""
+        series = self._hourly_cache.get(target_date)
+        if series is not None and self._is_complete(target_date, series):
+            return series
+        series = await self._async_retrieve_hourly_data(target_date)
+        now_local = dt_util.now()
+        if series and target_date >= now_local.date() - timedelta(days=HOURLY_CACHE_DAYS):
+            self._cache_hourly_data(target_date, series, now_local)
+        return series
+
+    async def async_iter_hourly_series(
+        self, start_date: date, end_date: date, max_concurrency=1
+    ) -> AsyncIterator[tuple[date, HourlySeries | None]]:
+        """Yield each day from start_date through end_date with its hourly data, in order.
+
+        Up to max_concurrency days are fetched at once; each day is yielded as
+        soon as it and every day before it have arrived, so consumers can rely
+        on the order. Days still in flight are cancelled when the iteration
+        stops early.
+        """
+        days = (start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1))
+        pending: deque[tuple[date, asyncio.Task]] = deque()
+
+        def fetch_next():
+            if (day := next(days, None)) is not None:
+                pending.append((day, asyncio.create_task(self.async_get_hourly_series(day))))
+
+        for _ in range(max(max_concurrency, 1)):
+            fetch_next()
+        try:
+            while pending:
+                day, task = pending.popleft()
+                series = await task
+                fetch_next()
+                yield day, series
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    def _hourly_fetch_due(self, target_date: date, now_local: datetime):
+        """Return True if the hourly data for target_date needs to be requested."""
+        series = self._hourly_cache.get(target_date)
+        if series is None:
+            return True
+        if self._is_complete(target_date, series):
+            # A complete day never changes again
+            return False
+        return now_local - self._hourly_fetched_at[target_date] >= HOURLY_PARTIAL_REFRESH
+
+    def _is_complete(self, target_date: date, series: HourlySeries):
+        """Return True if the series has a usage value for every hour of the local day."""
+        return series.count_known() >= self._expected_hours(target_date)
+
+    def _cache_hourly_data(self, target_date: date, series: HourlySeries, now_local: datetime):
+        """Store a day of hourly data and drop days that are no longer needed."""
+        self._hourly_cache[target_date] = series
+        self._hourly_fetched_at[target_date] = now_local
+        oldest = target_date - timedelta(days=HOURLY_CACHE_DAYS - 1)
+        for cached_date in [cached_date for cached_date in self._hourly_cache if cached_date < oldest]:
+            del self._hourly_cache[cached_date]
+            del self._hourly_fetched_at[cached_date]
+        for cached_date in [cached_date for cached_date in self._hourly_versions if cached_date < oldest]:
+            del self._hourly_versions[cached_date]
+
+    def _expected_hours(self, target_date: date):
+        """Return the number of hours in the local day, which is 23 or 25 on DST changes."""
+        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
+        start_dt = datetime.combine(target_date, datetime.min.time(), tzinfo=local_tz)
+        end_dt = datetime.combine(target_date + timedelta(days=1), datetime.min.time(), tzinfo=local_tz)
+        return round((end_dt.timestamp() - start_dt.timestamp()) / 3600)
+
+    async def async_get_usage_series(self, start_date: date, end_date: date, zoom=ZOOM_MONTH):
+        """Return the usage for start_date through end_date at a zoom level.
+
+        One request is made per calendar month for ZOOM_MONTH and per calendar
+        year for ZOOM_YEAR, so a long daily history or a set of billing-period
+        totals takes a handful of requests instead of one per day. Monthly
+        points describe whole months, so for ZOOM_YEAR the range is widened to
+        the first and last day of the months it touches; use
+        usage_series_range to find the range actually covered. Returns None if
+        any window could not be retrieved.
+        """
+        start_date, end_date = usage_series_range(start_date, end_date, zoom)
+        series = None
+        window_start = start_date
+        while window_start <= end_date:
+            if zoom == ZOOM_YEAR:
+                window_end = date(window_start.year, 12, 31)
+            elif zoom == ZOOM_MONTH:
+                window_end = _last_day_of_month(window_start)
+            else:
+                window_end = window_start
+            window_end = min(window_end, end_date)
+            start_ts = self._get_start_end_timestamps(window_start)[0]
+            end_ts = self._get_start_end_timestamps(window_end)[1]
+            window, _ = await self._async_retrieve_usage(start_ts, end_ts, zoom)
+            if window is None:
+                return None
+            window = window.between(start_ts, end_ts)
+            if series is None:
+                series = window
+            else:
+                series.extend(window)
+            window_start = window_end + timedelta(days=1)
+        return series
+
+    async def _async_retrieve_hourly_data(self, target_date: date):
+        """Retrieve hourly usage data for a specific date based on local time.
+
+        If the response is the same as the one the cached series came from,
+        the cached series itself is returned without processing it again.
+        """
+        cached = self._hourly_cache.get(target_date)
+        previous = self._hourly_versions.get(target_date) if cached is not None else None
+        series, version = await self._async_retrieve_usage(
+            *self._get_start_end_timestamps(target_date), ZOOM_DAY, previous
+        )
+        if previous is not None and version is previous:
+            return cached
+        if series is not None:
+            self._hourly_versions[target_date] = version
+        return series
+
+    async def _async_retrieve_usage(self, start_ts, end_ts, zoom, previous: PayloadVersion | None = None):
+        """Retrieve the usage between two timestamps (milliseconds) at a zoom level.
+
+        Returns the series and the version of its response; (None, previous)
+        if the response didn't change from previous, (None, None) on failure.
+        """
         # Prepare request parameters
-        start_ts, end_ts = self._get_start_end_timestamps(target_date)
-        usage_url, params = self._construct_hourly_data_request(start_ts, end_ts)
+        usage_path, params = self._construct_hourly_data_request(start_ts, end_ts, zoom)
 
-        _LOGGER.debug("Hourly data request URL: %s", usage_url)
+        _LOGGER.debug("Hourly data request path: %s", usage_path)
         _LOGGER.debug("Hourly data request parameters: %s", params)
 
         try:
-            response = session.get(usage_url, params=params, timeout=10)
-            response.raise_for_status()
-            hourly_data = response.json()
-            _LOGGER.debug("Hourly data response: %s", hourly_data)
+            with record_phase("hourly_fetch"):
+                hourly_data, series, version = await async_retry(self._async_get_usage, usage_path, params, previous)
+            if previous is not None and version is previous:
+                _LOGGER.debug("Hourly data response unchanged")
+                return None, previous
+            _LOGGER.debug("Hourly data response: %s rows", len(series) if series is not None else 0)
 
             # Validate and process the response
-            hourly_entries = self._process_hourly_data_response(hourly_data)
-            return hourly_entries
-
-        except requests.exceptions.RequestException as e:
+            with record_phase("post_processing"):
+                series = self._process_hourly_data_response(hourly_data, index=zoom == ZOOM_DAY, series=series)
+            if series and zoom == ZOOM_DAY:
+                with record_phase("archive"):
+                    await self._async_archive(series)
+            return series, version
+
+        except (aiohttp.ClientError, TimeoutError, SensusAnalyticsError) as e:
             _LOGGER.error("Hourly data retrieval failed: %s", e)
-            return None
+            return None, None
         except (KeyError, TypeError, ValueError) as e:
             _LOGGER.error("Error processing the hourly data response: %s", e)
-            return None
+            return None, None
+
+    async def _async_archive(self, series: HourlySeries):
+        """Add hourly readings to the long-term archive; failures only cost the archive."""
+        try:
+            await self.archive.async_append(series)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not archive hourly usage to %s: %s", self.archive.path, err)
+
+    async def _async_get_usage(self, usage_path, params, previous=None):
+        """Request a usage payload once, decoding its rows into a series as they arrive.
+
+        Returns the rest of the payload, the series (None if no units row
+        arrived) and the version of the response.
+        """
+        builder = HourlySeriesBuilder()
+        async with asyncio.timeout(HOURLY_FETCH_TIMEOUT):
+            hourly_data, version = await self.session.async_get_json_stream(
+                usage_path, USAGE_ROWS_PATH, builder.add_row, params=params, previous=previous
+            )
+        return hourly_data, builder.series, version
 
     def _get_start_end_timestamps(self, target_date):
         """Get start and end timestamps in milliseconds for the target date."""
@@ -148,20 +577,25 @@ class SensusAnalyticsDataUpdateCoordinator(DataUpdateCoordinator):
         end_ts = int(end_dt.timestamp() * 1000)
         return start_ts, end_ts
 
-    def _construct_hourly_data_request(self, start_ts, end_ts):
-        """Construct the hourly data request URL and parameters."""
-        usage_url = urljoin(self.base_url, f"water/usage/{self.account_number}/{self.meter_number}")
+    def _construct_hourly_data_request(self, start_ts, end_ts, zoom=ZOOM_DAY):
+        """Construct the usage request path and parameters; ZOOM_DAY returns hourly points."""
+        usage_path = f"water/usage/{self.account_number}/{self.meter_number}"
         params = {
             "start": start_ts,
             "end": end_ts,
-            "zoom": "day",
+            "zoom": zoom,
             "page": "null",
             "weather": "1",
         }
-        return usage_url, params
+        return usage_path, params
+
+    def _process_hourly_data_response(self, hourly_data, index=True, series: HourlySeries | None = None):
+        """Process a usage response into an HourlySeries, indexed by local hour if index is set.
 
-    def _process_hourly_data_response(self, hourly_data):
-        """Process and structure the hourly data response."""
+        Coarser zoom levels return the same shape with one row per day or
+        month. When the rows were already decoded from the stream, series
+        holds them and hourly_data the rest of the response.
+        """
         if not isinstance(hourly_data, dict):
             _LOGGER.error("Unexpected response format for hourly data.")
             return None
@@ -171,31 +605,29 @@ class SensusAnalyticsDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error("API returned errors: %s", errors)
             return None
 
-        usage_list = hourly_data.get("data", {}).get("usage", [])
-        if not usage_list or len(usage_list) < 2:
+        if series is None:
+            # The first row contains units, e.g. ["CCF", "INCHES", "FAHRENHEIT", "gal"], the rest one row per interval
+            builder = HourlySeriesBuilder()
+            for entry in hourly_data.get("data", {}).get("usage", []):
+                builder.add_row(entry)
+            series = builder.series
+        if series is None:
             _LOGGER.error("Hourly usage data is missing or incomplete.")
             return None
+        # A series without rows is returned as it is: the portal has no readings for the period
+
+        if index:
+            series.build_index(dt_util.get_time_zone(self.hass.config.time_zone))
+        return series
+
+
+def usage_series_range(start_date: date, end_date: date, zoom) -> tuple[date, date]:
+    """Return the dates a usage series at a zoom level covers for a requested range."""
+    if zoom == ZOOM_YEAR:
+        return start_date.replace(day=1), _last_day_of_month(end_date)
+    return start_date, end_date
 
-        # The first element contains units
-        units = usage_list[0]  # ["CCF", "INCHES", "FAHRENHEIT", "gal"]
-        usage_unit = units[0]
-        rain_unit = units[1]
-        temp_unit = units[2]
-
-        # The rest of the list contains hourly data
-        hourly_entries = []
-        for entry in usage_list[1:]:
-            timestamp, usage, rain, temp = entry[:4]
-            hourly_entries.append(
-                {
-                    "timestamp": timestamp,
-                    "usage": usage,
-                    "rain": rain,
-                    "temp": temp,
-                    "usage_unit": usage_unit,
-                    "rain_unit": rain_unit,
-                    "temp_unit": temp_unit,
-                }
-            )
 
-        return hourly_entries
+def _last_day_of_month(day: date) -> date:
+    """Return the last day of the month a date falls in."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
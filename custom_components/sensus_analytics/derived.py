@@ -0,0 +1,133 @@
+"""Derived values computed once per Sensus Analytics refresh."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .conversion import convert_usage
+from .hourly import HourlyReading, HourlySeries
+from .tariff import Tariff
+
+# Widget fields describing the meter itself, which practically never change
+METADATA_FIELDS = ("meterAddress1", "meterId", "meterLat", "meterLong", "usageUnit")
+
+
+@dataclass(frozen=True, slots=True)
+class SensusAnalyticsMetadata:
+    """Static description of the meter, refreshed on the slow metadata tier."""
+
+    native_usage_unit: str | None
+    meter_address: str | None
+    meter_id: str | None
+    meter_latitude: float | None
+    meter_longitude: float | None
+
+    @classmethod
+    def from_device(cls, device: Mapping) -> SensusAnalyticsMetadata:
+        """Build the metadata from a widget device payload."""
+        return cls(
+            native_usage_unit=device.get("usageUnit"),
+            meter_address=device.get("meterAddress1"),
+            meter_id=device.get("meterId"),
+            meter_latitude=device.get("meterLat"),
+            meter_longitude=device.get("meterLong"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SensusAnalyticsDerivedData:  # pylint: disable=too-many-instance-attributes
+    """Immutable view of the values the sensors publish.
+
+    Built by the coordinator once per refresh (and when the config entry
+    changes) so the sensors only read fields, however often their state is
+    requested.
+    """
+
+    metadata: SensusAnalyticsMetadata
+    usage_unit: str | None
+    daily_usage: float | None
+    meter_odometer: float | None
+    billing_usage: float | None
+    billing_cost: float | None
+    daily_fee: float | None
+    last_read: datetime | None
+    start_of_day: datetime
+    start_of_month: datetime
+    last_hour_start: datetime
+    last_hour: HourlyReading | None
+    last_hour_usage: float | None
+    last_hour_time: str | None
+
+    def is_current(self, now: datetime):
+        """Return True while the time-dependent values still hold, i.e. within the hour they were built."""
+        return self.last_hour_start == now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+
+def _parse_last_read(last_read_ts):
+    """Convert a millisecond timestamp to a UTC datetime."""
+    if not last_read_ts:
+        return None
+    try:
+        return dt_util.utc_from_timestamp(last_read_ts / 1000)
+    except (ValueError, TypeError):
+        return None
+
+
+def _last_hour_reading(hourly_series: HourlySeries | None, now: datetime) -> HourlyReading | None:
+    """Return yesterday's reading for the current hour.
+
+    During the repeated hour after DST ends the lookup falls back to the first occurrence.
+    """
+    if not hourly_series:
+        return None
+    return hourly_series.lookup(now.date() - timedelta(days=1), now.hour, now.fold)
+
+
+def build_derived_data(
+    data: Mapping, metadata: SensusAnalyticsMetadata, config_data: Mapping, tariff: Tariff
+) -> SensusAnalyticsDerivedData:
+    """Compute every published value from a coordinator payload and the meter metadata."""
+    now = dt_util.now()
+    unit_type = config_data.get("unit_type")
+
+    def convert(usage, usage_unit=metadata.native_usage_unit):
+        return convert_usage(usage, usage_unit, unit_type)
+
+    # Return the user's configured unit type, falling back to the API-reported
+    # unit if the config is unexpected
+    usage_unit = unit_type if unit_type in ("gal", "CCF") else metadata.native_usage_unit
+
+    daily_usage = convert(data.get("dailyUsage"))
+    billing_usage = convert(data.get("billingUsage"))
+    # The day is priced at the tiers the billing period has reached by then
+    billing_cost, daily_fee = tariff.period_costs(billing_usage, daily_usage)
+
+    last_hour = _last_hour_reading(data.get("hourly_usage_data"), now)
+    last_hour_usage = None
+    last_hour_time = None
+    if last_hour is not None:
+        last_hour_usage = convert(last_hour.usage, data["hourly_usage_data"].usage_unit)
+        last_hour_time = dt_util.as_local(dt_util.utc_from_timestamp(last_hour.timestamp / 1000)).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+    return SensusAnalyticsDerivedData(
+        metadata=metadata,
+        usage_unit=usage_unit,
+        daily_usage=daily_usage,
+        meter_odometer=convert(data.get("latestReadUsage")),
+        billing_usage=billing_usage,
+        billing_cost=billing_cost,
+        daily_fee=daily_fee,
+        last_read=_parse_last_read(data.get("lastRead")),
+        start_of_day=dt_util.start_of_local_day(now),
+        start_of_month=now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+        last_hour_start=now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=1),
+        last_hour=last_hour,
+        last_hour_usage=last_hour_usage,
+        last_hour_time=last_hour_time,
+    )
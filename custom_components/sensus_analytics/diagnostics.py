@@ -0,0 +1,65 @@
+"""Diagnostics support for the Sensus Analytics Integration."""
+
+from __future__ import annotations
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ACCOUNT_NUMBER, CONF_METER_NUMBER, CONF_PASSWORD, CONF_USERNAME, DOMAIN
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_ACCOUNT_NUMBER,
+    CONF_METER_NUMBER,
+    "meterAddress1",
+    "meterId",
+    "meterLat",
+    "meterLong",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    session = coordinator.session
+    data = None
+    if coordinator.data is not None:
+        data = {key: value for key, value in coordinator.data.items() if key != "hourly_usage_data"}
+        hourly_series = coordinator.data.get("hourly_usage_data")
+        data["hourly_usage_entries"] = len(hourly_series) if hourly_series else 0
+    try:
+        archive = await coordinator.archive.async_info()
+    except (OSError, ValueError) as error:
+        # A damaged archive is worth reporting, but not with its path, which names the account and meter
+        archive = {"error": str(error).replace(str(coordinator.archive.path), "<archive>")}
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "data_updated_at": coordinator.data_updated_at,
+        "update_interval": str(coordinator.update_interval),
+        "poll_cadence": str(coordinator.poll_scheduler.cadence),
+        "session": {
+            "requests": session.request_count,
+            "logins": session.login_count,
+            "reauthentications": session.reauth_count,
+        },
+        "account_client": {
+            "meters": coordinator.client.meter_count,
+            "widget_requests": coordinator.client.widget_request_count,
+            "widget_responses_shared": coordinator.client.widget_shared_count,
+        },
+        "host_scheduler": {
+            "rate_per_minute": session.scheduler.rate,
+            "max_concurrency": session.scheduler.max_concurrency,
+            "requests": session.scheduler.request_count,
+            "queued": session.scheduler.queued_count,
+            "pending": session.scheduler.pending,
+            "circuit_breaker": session.scheduler.circuit_breaker.as_dict(),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "archive": archive,
+        "data": async_redact_data(data, TO_REDACT) if data is not None else None,
+    }
@@ -0,0 +1,187 @@
+"""Compact storage for hourly Sensus Analytics readings."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import tzinfo
+from typing import NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+
+class HourlyReading(NamedTuple):
+    """A single hourly reading, with None for values the portal left empty."""
+
+    timestamp: int
+    usage: float | None
+    rain: float | None
+    temp: float | None
+
+
+def _to_float(value):
+    """Return value as a float, using NaN for missing or malformed values."""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _from_float(value):
+    """Return None for NaN, otherwise the value unchanged."""
+    return None if math.isnan(value) else value
+
+
+class HourlySeries:  # pylint: disable=too-many-instance-attributes
+    """Column-oriented series of hourly readings.
+
+    Millisecond timestamps are kept in an ``array('q')`` and usage, rain and
+    temperature in ``array('d')`` columns, with NaN marking missing values.
+    Units are stored once for the whole series rather than on every row.
+    Rows are expected in ascending timestamp order, as the portal returns them.
+    Usage requested at a coarser zoom level is kept the same way, with one
+    row per day or month.
+    """
+
+    __slots__ = ("timestamps", "usage", "rain", "temp", "usage_unit", "rain_unit", "temp_unit", "_index")
+
+    def __init__(self, usage_unit=None, rain_unit=None, temp_unit=None):
+        """Initialize an empty series."""
+        self.timestamps = array("q")
+        self.usage = array("d")
+        self.rain = array("d")
+        self.temp = array("d")
+        self.usage_unit = usage_unit
+        self.rain_unit = rain_unit
+        self.temp_unit = temp_unit
+        self._index = None
+
+    def append(self, timestamp, usage, rain, temp):
+        """Append one reading to the end of the series."""
+        self.timestamps.append(int(timestamp))
+        self.usage.append(_to_float(usage))
+        self.rain.append(_to_float(rain))
+        self.temp.append(_to_float(temp))
+        self._index = None
+
+    def extend(self, other: HourlySeries):
+        """Append the readings of a later series with the same units."""
+        self.timestamps.extend(other.timestamps)
+        self.usage.extend(other.usage)
+        self.rain.extend(other.rain)
+        self.temp.extend(other.temp)
+        self._index = None
+
+    def __len__(self):
+        """Return the number of readings."""
+        return len(self.timestamps)
+
+    def __iter__(self):
+        """Iterate over the readings in timestamp order."""
+        for position in range(len(self.timestamps)):
+            yield self.reading(position)
+
+    def __getitem__(self, key):
+        """Return a reading, or a new series for a slice."""
+        if isinstance(key, slice):
+            series = self._empty_like()
+            series.timestamps = self.timestamps[key]
+            series.usage = self.usage[key]
+            series.rain = self.rain[key]
+            series.temp = self.temp[key]
+            return series
+        return self.reading(key)
+
+    def reading(self, position) -> HourlyReading:
+        """Return the reading stored at position."""
+        return HourlyReading(
+            self.timestamps[position],
+            _from_float(self.usage[position]),
+            _from_float(self.rain[position]),
+            _from_float(self.temp[position]),
+        )
+
+    def between(self, start_ts, end_ts) -> HourlySeries:
+        """Return the readings with start_ts <= timestamp <= end_ts (milliseconds)."""
+        return self[bisect_left(self.timestamps, start_ts) : bisect_right(self.timestamps, end_ts)]
+
+    def total_usage(self):
+        """Return the sum of all known usage values."""
+        return math.fsum(value for value in self.usage if not math.isnan(value))
+
+    def count_known(self):
+        """Return the number of readings that carry a usage value."""
+        return sum(1 for value in self.usage if not math.isnan(value))
+
+    def build_index(self, local_tz: tzinfo):
+        """Index the readings by ``(local date, local hour, fold)``.
+
+        The fold tells the two occurrences of the repeated hour apart on the day
+        DST ends; the missing hour on the day DST starts simply has no entry.
+        """
+        index = {}
+        for position, timestamp in enumerate(self.timestamps):
+            local_time = dt_util.utc_from_timestamp(timestamp / 1000).astimezone(local_tz)
+            index.setdefault((local_time.date(), local_time.hour, local_time.fold), position)
+        self._index = index
+
+    def lookup(self, date, hour, fold=0) -> HourlyReading | None:
+        """Return the reading for a local date and hour from the index."""
+        if self._index is None:
+            return None
+        position = self._index.get((date, hour, fold))
+        if position is None and fold:
+            position = self._index.get((date, hour, 0))
+        if position is None:
+            return None
+        return self.reading(position)
+
+    def as_dict(self):
+        """Return a JSON-serializable representation of the series."""
+        return {
+            "units": [self.usage_unit, self.rain_unit, self.temp_unit],
+            "timestamps": self.timestamps.tolist(),
+            "usage": [_from_float(value) for value in self.usage],
+            "rain": [_from_float(value) for value in self.rain],
+            "temp": [_from_float(value) for value in self.temp],
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> HourlySeries:
+        """Rebuild a series from the output of as_dict."""
+        series = cls(*data["units"])
+        series.timestamps = array("q", data["timestamps"])
+        series.usage = array("d", map(_to_float, data["usage"]))
+        series.rain = array("d", map(_to_float, data["rain"]))
+        series.temp = array("d", map(_to_float, data["temp"]))
+        return series
+
+    def _empty_like(self) -> HourlySeries:
+        """Return an empty series with the same units."""
+        return HourlySeries(self.usage_unit, self.rain_unit, self.temp_unit)
+
+
+class HourlySeriesBuilder:  # pylint: disable=too-few-public-methods
+    """Build an HourlySeries from the rows of a usage response as they are decoded.
+
+    The first row holds the units, every further row one reading. Rows and
+    the units may leave out the trailing weather columns, as responses at
+    coarser zoom levels do; those are stored as missing.
+    """
+
+    __slots__ = ("series",)
+
+    def __init__(self):
+        """Initialize the builder; series stays None until the units arrive."""
+        self.series: HourlySeries | None = None
+
+    def add_row(self, row):
+        """Add the next row of the response."""
+        if self.series is None:
+            units = [*row[:3], None, None]
+            self.series = HourlySeries(usage_unit=units[0], rain_unit=units[1], temp_unit=units[2])
+        else:
+            self.series.append(*row[:4], *(None,) * (4 - len(row)))
@@ -0,0 +1,156 @@
+"""Incremental decoding of large Sensus Analytics JSON responses."""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+from collections.abc import AsyncIterator, Callable
+
+WHITESPACE = " \t\n\r"
+# Characters that may follow a number
+DELIMITERS = frozenset(",]}" + WHITESPACE)
+
+
+class JsonStreamDecoder:  # pylint: disable=too-many-instance-attributes
+    """Decode a JSON document from a stream of chunks, one array element at a time.
+
+    ``path`` leads to an array inside the document, e.g. ``("data", "usage")``
+    or ``("widgetList", 0, "data", "devices")``. Each of its elements is
+    decoded on its own with ``raw_decode`` as soon as its text is complete and
+    handed to ``on_item``, so neither the text nor the objects of the whole
+    array are ever held at once. The rest of the document is decoded as usual
+    and returned, with an empty list in place of the array. Only the text of
+    the value being decoded is buffered. The raw bytes are fingerprinted on
+    the way through.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], path, on_item: Callable[[object], None]):
+        """Initialize the decoder."""
+        self._chunks = aiter(chunks)
+        self._path = tuple(path)
+        self._on_item = on_item
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._digest = hashlib.blake2b(digest_size=16)
+        self.size = 0
+        self.item_count = 0
+
+    @property
+    def fingerprint(self) -> bytes:
+        """Return the BLAKE2b digest of the bytes read so far."""
+        return self._digest.digest()
+
+    async def async_decode(self):
+        """Decode the document, streaming the array, and return the rest of it."""
+        if await self._async_peek() not in ("{", "["):
+            raise ValueError("Response is not a JSON document")
+        document = await self._async_value(self._path)
+        if await self._async_peek() is not None:
+            raise ValueError("Extra data after the JSON document")
+        return document
+
+    async def _async_value(self, path):
+        """Decode the value at the read position; path leads to the array within it, or is None."""
+        char = await self._async_peek()
+        if path == () and char == "[":
+            await self._async_stream_array()
+            return []
+        if path and char == "{" and isinstance(path[0], str):
+            return await self._async_object(path)
+        if path and char == "[" and isinstance(path[0], int):
+            return await self._async_array(path)
+        # Off the path, or the document doesn't have the expected shape
+        return await self._async_decode_value()
+
+    async def _async_object(self, path):
+        """Decode an object, descending into the member named by path[0]."""
+        self._pos += 1
+        result = {}
+        if await self._async_peek() == "}":
+            self._pos += 1
+            return result
+        while True:
+            key = await self._async_decode_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected an object key, got {key!r}")
+            await self._async_expect(":")
+            result[key] = await self._async_value(path[1:] if key == path[0] else None)
+            if await self._async_expect(",}") == "}":
+                return result
+
+    async def _async_array(self, path):
+        """Decode an array, descending into the element at index path[0]."""
+        self._pos += 1
+        result = []
+        if await self._async_peek() == "]":
+            self._pos += 1
+            return result
+        while True:
+            result.append(await self._async_value(path[1:] if len(result) == path[0] else None))
+            if await self._async_expect(",]") == "]":
+                return result
+
+    async def _async_stream_array(self):
+        """Hand each element of the array at the read position to on_item."""
+        self._pos += 1
+        if await self._async_peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            self._on_item(await self._async_decode_value())
+            self.item_count += 1
+            if await self._async_expect(",]") == "]":
+                return
+
+    async def _async_decode_value(self):
+        """Decode one complete value, reading more text until it is complete."""
+        await self._async_peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number is only complete once a delimiter follows; it may continue in the next chunk
+                if self._eof or isinstance(value, (str, list, dict)) or self._buffer[end : end + 1] in DELIMITERS:
+                    self._pos = end
+                    return value
+            await self._async_read()
+
+    async def _async_peek(self):
+        """Skip whitespace and return the next character, or None at the end of the document."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return None
+            await self._async_read()
+
+    async def _async_expect(self, chars):
+        """Consume and return the next character, which must be one of chars."""
+        char = await self._async_peek()
+        if char is None or char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    async def _async_read(self):
+        """Append the next chunk to the buffer, dropping the text already decoded."""
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self._eof = True
+            self._buffer += self._text.decode(b"", final=True)
+            return
+        self.size += len(chunk)
+        self._digest.update(chunk)
+        self._buffer += self._text.decode(chunk)
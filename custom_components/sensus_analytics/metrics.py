@@ -0,0 +1,133 @@
+"""Refresh timing instrumentation for the Sensus Analytics Integration."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Number of samples each rolling histogram keeps for its percentiles
+HISTOGRAM_SAMPLES = 100
+# Upper bucket bounds for phase durations, in milliseconds
+DURATION_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# Upper bucket bounds for response sizes, in bytes
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Metrics of the refresh running in the current task. The coordinator sets it
+# around a refresh, so the portal client can record phases without having the
+# metrics object passed through every call; tasks started by the refresh
+# inherit it.
+CURRENT_METRICS: ContextVar[RefreshMetrics | None] = ContextVar("sensus_analytics_metrics", default=None)
+
+
+class RollingHistogram:
+    """Bucket counts over all samples plus percentiles over the most recent ones."""
+
+    def __init__(self, buckets):
+        """Initialize the histogram with upper bucket bounds."""
+        self._bounds = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._recent: deque[float] = deque(maxlen=HISTOGRAM_SAMPLES)
+        self.count = 0
+
+    def add(self, value):
+        """Record one sample."""
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._recent.append(value)
+        self.count += 1
+
+    @property
+    def last(self):
+        """Return the most recent sample."""
+        return self._recent[-1] if self._recent else None
+
+    def as_dict(self):
+        """Return a summary suitable for diagnostics."""
+        recent = sorted(self._recent)
+        summary = {"count": self.count, "last": self.last}
+        if recent:
+            summary.update(
+                {
+                    "mean": round(sum(recent) / len(recent), 1),
+                    "p50": recent[len(recent) // 2],
+                    "p95": recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+                    "max": recent[-1],
+                }
+            )
+        labels = [f"<={bound}" for bound in self._bounds] + [f">{self._bounds[-1]}"]
+        summary["buckets"] = dict(zip(labels, self._counts))
+        return summary
+
+
+class RefreshMetrics:
+    """Timing, outcome and size statistics for each phase of a refresh."""
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.durations: dict[str, RollingHistogram] = {}
+        self.outcomes: dict[str, Counter] = {}
+        self.sizes: dict[str, RollingHistogram] = {}
+        # Responses, and whole refreshes, found identical to the previous ones
+        self.unchanged: Counter = Counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as the named phase and count its outcome."""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+            self.durations.setdefault(name, RollingHistogram(DURATION_BUCKETS_MS)).add(elapsed_ms)
+            self.outcomes.setdefault(name, Counter())[outcome] += 1
+
+    def record_size(self, name, size):
+        """Record the size in bytes of a response."""
+        self.sizes.setdefault(name, RollingHistogram(SIZE_BUCKETS)).add(size)
+
+    def record_unchanged(self, name):
+        """Count a response or refresh whose processing was skipped because nothing changed."""
+        self.unchanged[name] += 1
+
+    def last_duration(self, name):
+        """Return the most recent duration of a phase in milliseconds."""
+        histogram = self.durations.get(name)
+        return histogram.last if histogram else None
+
+    def as_dict(self):
+        """Return all metrics suitable for diagnostics."""
+        return {
+            "phases": {
+                name: {**histogram.as_dict(), "outcomes": dict(self.outcomes[name])}
+                for name, histogram in self.durations.items()
+            },
+            "response_sizes": {name: histogram.as_dict() for name, histogram in self.sizes.items()},
+            "unchanged": dict(self.unchanged),
+        }
+
+
+@contextmanager
+def record_phase(name):
+    """Time a block against the current refresh's metrics, if any."""
+    metrics = CURRENT_METRICS.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.phase(name):
+        yield
+
+
+def record_size(name, size):
+    """Record a response size against the current refresh's metrics, if any."""
+    if (metrics := CURRENT_METRICS.get()) is not None:
+        metrics.record_size(name, size)
+
+
+def record_unchanged(name):
+    """Count an unchanged response against the current refresh's metrics, if any."""
+    if (metrics := CURRENT_METRICS.get()) is not None:
+        metrics.record_unchanged(name)
@@ -0,0 +1,87 @@
+"""Adaptive polling schedule for the Sensus Analytics coordinator."""
+
+from __future__ import annotations
+
+import logging
+import random
+from collections import deque
+from datetime import datetime, timedelta
+from statistics import median
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long after the expected upload the next poll is placed
+POLL_MARGIN = timedelta(minutes=2)
+# Number of read-to-read intervals used to estimate the cadence
+CADENCE_SAMPLES = 8
+# Fraction by which each delay is randomly lengthened or shortened, so entries
+# started together drift apart instead of polling the portal in bursts
+POLL_JITTER = 0.1
+# Shortest interval used even if an entry was saved with a smaller minimum
+MIN_POLL_INTERVAL = timedelta(minutes=1)
+
+
+class AdaptivePollScheduler:
+    """Schedule polls around the meter's upload cadence.
+
+    The cadence is learned from successive distinct ``lastRead`` values and the
+    portal's publishing lag from how long after a read it was first seen. The
+    next poll is placed just after the next read is expected to be visible.
+    When no read is expected yet, or an expected read is overdue, the interval
+    backs off exponentially from the minimum. Every delay is jittered by up to
+    ``POLL_JITTER``, then clamped to the configured minimum and maximum.
+    """
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta):
+        """Initialize the scheduler."""
+        self.min_interval = max(min_interval, MIN_POLL_INTERVAL)
+        self.max_interval = max(max_interval, self.min_interval)
+        self._intervals: deque[float] = deque(maxlen=CADENCE_SAMPLES)
+        self._last_read: datetime | None = None
+        self._lag: timedelta | None = None
+        self._unchanged_polls = 0
+
+    @property
+    def cadence(self) -> timedelta | None:
+        """Return the learned interval between meter reads, if known."""
+        if not self._intervals:
+            return None
+        return timedelta(seconds=median(self._intervals))
+
+    def observe(self, last_read: datetime | None, now: datetime) -> timedelta:
+        """Record the outcome of a poll and return the delay until the next one."""
+        if last_read is not None and last_read != self._last_read:
+            if self._last_read is not None and last_read > self._last_read:
+                self._intervals.append((last_read - self._last_read).total_seconds())
+            self._last_read = last_read
+            # Reads are only noticed on the next poll, so the smallest gap seen
+            # is the best estimate of how long the portal takes to publish one
+            lag = max(now - last_read, timedelta(0))
+            self._lag = lag if self._lag is None else min(self._lag, lag)
+            self._unchanged_polls = 0
+        else:
+            self._unchanged_polls += 1
+
+        delay = self._clamp(self._next_delay(now) * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER))
+        _LOGGER.debug(
+            "Next poll in %s (cadence %s, lag %s, %s unchanged polls)",
+            delay,
+            self.cadence,
+            self._lag,
+            self._unchanged_polls,
+        )
+        return delay
+
+    def _next_delay(self, now: datetime) -> timedelta:
+        """Return the delay until the next poll, before jitter and clamping."""
+        cadence = self.cadence
+        if cadence is not None and self._last_read is not None:
+            expected = self._last_read + cadence + self._lag + POLL_MARGIN
+            if expected > now:
+                return expected - now
+        # No read expected yet, or the expected one is late: back off
+        return self.min_interval * (2 ** min(self._unchanged_polls, 16))
+
+    def _clamp(self, delay: timedelta) -> timedelta:
+        """Clamp delay to the configured bounds."""
+        return min(max(delay, self.min_interval), self.max_interval)
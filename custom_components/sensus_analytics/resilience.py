@@ -0,0 +1,127 @@
+"""Retry and circuit breaker helpers for the Sensus Analytics Integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import timedelta
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Attempts made for one fetch before its error is raised
+RETRY_ATTEMPTS = 3
+# Upper bound of the first backoff delay in seconds; it doubles with every attempt
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 20.0
+# Response statuses worth retrying; any other error status won't change on retry
+TRANSIENT_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+
+# Consecutive transient failures after which requests to a host are suspended
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = timedelta(minutes=5)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True if a request failed in a way that may succeed when repeated."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in TRANSIENT_STATUSES
+    return isinstance(error, (aiohttp.ClientError, TimeoutError))
+
+
+async def async_retry(func, *args, attempts=RETRY_ATTEMPTS):
+    """Await func(*args), retrying transient errors with jittered exponential backoff.
+
+    Each delay is drawn uniformly between zero and the current backoff bound
+    ("full jitter"), so callers failing together don't retry together.
+    """
+    for attempt in range(attempts):
+        try:
+            return await func(*args)
+        except (aiohttp.ClientError, TimeoutError) as error:
+            if attempt == attempts - 1 or not is_transient(error):
+                raise
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+            _LOGGER.debug("Attempt %s failed (%r), retrying in %.1f s", attempt + 1, error, delay)
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Suspend requests to a host after repeated transient failures.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and requests are refused for ``cooldown``. Then a single trial
+    request is let through: if the host answers, the circuit closes; if it
+    fails again, the circuit stays open for another cooldown. Any answer from
+    the host counts as healthy, including errors that retrying won't fix.
+    """
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN):
+        """Initialize a closed circuit."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.trip_count = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self):
+        """Return "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        return "open" if self.retry_after else "half_open"
+
+    @property
+    def retry_after(self) -> timedelta | None:
+        """Return how long requests are still refused, or None if they are allowed."""
+        if self._opened_at is None:
+            return None
+        remaining = self.cooldown.total_seconds() - (time.monotonic() - self._opened_at)
+        return timedelta(seconds=remaining) if remaining > 0 else None
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent, claiming the trial when half open."""
+        if self._opened_at is None:
+            return True
+        if self.retry_after or self._trial:
+            return False
+        self._trial = True
+        return True
+
+    def record(self, healthy: bool | None):
+        """Record the outcome of a request; None for one that was cancelled."""
+        if healthy is None:
+            self._trial = False
+        elif healthy:
+            if self._opened_at is not None:
+                _LOGGER.info("%s is answering again, resuming requests", self.name)
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+        else:
+            self.failures += 1
+            if self._trial or (self._opened_at is None and self.failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._trial = False
+                self.trip_count += 1
+                _LOGGER.warning(
+                    "%s failed %s requests in a row, suspending requests for %s",
+                    self.name,
+                    self.failures,
+                    self.cooldown,
+                )
+
+    def as_dict(self):
+        """Return the circuit state for diagnostics."""
+        retry_after = self.retry_after
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trip_count,
+            "retry_after": str(retry_after) if retry_after else None,
+        }
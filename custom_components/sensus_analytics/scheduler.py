@@ -0,0 +1,151 @@
+"""Host-wide request scheduling for the Sensus Analytics Integration."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_HOST_SCHEDULERS, DEFAULT_HOST_MAX_CONCURRENCY, DEFAULT_HOST_REQUEST_RATE, DOMAIN
+from .metrics import record_phase
+from .resilience import CircuitBreaker
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request priorities, lowest value first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_POLL = 1
+PRIORITY_BACKGROUND = 2
+
+# Priority of the requests made by the current task. A refresh started from the
+# options flow raises it, the statistics backfill lowers it; tasks started
+# from there inherit it.
+REQUEST_PRIORITY: ContextVar[int] = ContextVar("sensus_analytics_request_priority", default=PRIORITY_POLL)
+
+
+class HostRequestScheduler:  # pylint: disable=too-many-instance-attributes
+    """Rate limit and order the requests of every config entry against one portal host.
+
+    Requests wait in a priority queue and are admitted while fewer than
+    ``max_concurrency`` are in flight and the token bucket, refilled at
+    ``rate`` requests per minute up to one second's worth (at least one), has
+    a token left. Interactive requests are admitted before background polls,
+    which are admitted before backfills; equal priorities keep their order.
+    The host's circuit breaker is kept here too, as it is shared the same way.
+    """
+
+    def __init__(self, host, rate=DEFAULT_HOST_REQUEST_RATE, max_concurrency=DEFAULT_HOST_MAX_CONCURRENCY):
+        """Initialize the scheduler."""
+        self.host = host
+        self.circuit_breaker = CircuitBreaker(f"Sensus portal {host}")
+        # Entries saved before the settings were validated may hold 0, which would stop all requests
+        self.rate = max(rate, 1)
+        self.max_concurrency = max(max_concurrency, 1)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.request_count = 0
+        self.queued_count = 0
+
+    @property
+    def _capacity(self):
+        """Return the size of the token bucket."""
+        return max(self.rate / 60, 1.0)
+
+    @property
+    def pending(self):
+        """Return the number of requests waiting for a slot."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    def configure(self, rate, max_concurrency):
+        """Apply a new rate and concurrency cap, e.g. after an entry's options changed."""
+        rate, max_concurrency = max(rate, 1), max(max_concurrency, 1)
+        if (rate, max_concurrency) == (self.rate, self.max_concurrency):
+            return
+        self.rate = rate
+        self.max_concurrency = max_concurrency
+        self._tokens = min(self._tokens, self._capacity)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def async_slot(self, priority: int | None = None):
+        """Wait for a request slot and hold it for the duration of the block."""
+        with record_phase("scheduler_wait"):
+            await self._async_acquire(REQUEST_PRIORITY.get() if priority is None else priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority):
+        """Queue for a slot and wait until it is granted."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._dispatch()
+        if not future.done():
+            self.queued_count += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been granted just before the wait was cancelled
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        """Return a slot and admit the next waiters."""
+        self._active -= 1
+        self._dispatch()
+
+    def _refill(self):
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * self.rate / 60)
+        self._refilled_at = now
+
+    def _dispatch(self):
+        """Admit waiters in priority order while slots and tokens are available."""
+        self._refill()
+        while self._waiters and self._active < self.max_concurrency:
+            future = self._waiters[0][2]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                if self._timer is None:
+                    delay = (1 - self._tokens) * 60 / self.rate
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._async_timer_expired)
+                return
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._active += 1
+            self.request_count += 1
+            future.set_result(None)
+
+    @callback
+    def _async_timer_expired(self):
+        """Admit waiters once the bucket has a token again."""
+        self._timer = None
+        self._dispatch()
+
+
+@callback
+def async_get_host_scheduler(hass: HomeAssistant, base_url) -> HostRequestScheduler:
+    """Return the scheduler shared by every entry against the host of base_url."""
+    schedulers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_HOST_SCHEDULERS, {})
+    host = urlsplit(base_url).netloc.lower()
+    if (scheduler := schedulers.get(host)) is None:
+        scheduler = schedulers[host] = HostRequestScheduler(host)
+        _LOGGER.debug("Created request scheduler for %s", host)
+    return scheduler
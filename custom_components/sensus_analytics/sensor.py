@@ -1,19 +1,14 @@
 """Sensor platform for the Sensus Analytics Integration."""
 
-from datetime import datetime, timedelta
-
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
 from .const import DEFAULT_NAME, DOMAIN
 
-CF_TO_GALLON = 7.48052
-CF_PER_CCF = 100  # 1 CCF = 100 cubic feet
-
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up the Sensus Analytics sensor platform."""
@@ -35,60 +30,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         LastHourRainfallSensor(coordinator, entry),
         LastHourTemperatureSensor(coordinator, entry),
         LastHourTimestampSensor(coordinator, entry),
+        SensusAnalyticsRefreshDurationSensor(coordinator, entry),
+        SensusAnalyticsReauthCountSensor(coordinator, entry),
     ]
-    async_add_entities(sensors, True)
-
-
-# pylint: disable=too-few-public-methods
-class UsageConversionMixin:
-    """Mixin to provide usage conversion."""
-
-    # pylint: disable=too-many-return-statements
-    def _convert_usage(self, usage, usage_unit=None):
-        """Convert usage based on configuration and native unit."""
-        if usage is None:
-            return None
-        if usage_unit is None:
-            usage_unit = self.coordinator.data.get("usageUnit")
-
-        config_unit_type = self.coordinator.config_entry.data.get("unit_type")
-
-        try:
-            usage_float = float(usage)
-        except (ValueError, TypeError):
-            return None
-
-        # CF (cubic feet) conversions
-        if usage_unit == "CF" and config_unit_type == "gal":
-            return round(usage_float * CF_TO_GALLON)
-        if usage_unit == "CF" and config_unit_type == "CCF":
-            return round(usage_float / CF_PER_CCF, 2)
-
-        # GAL (gallons) conversions
-        if usage_unit == "GAL" and config_unit_type == "gal":
-            return usage
-        if usage_unit == "GAL" and config_unit_type == "CCF":
-            # Convert gallons to cubic feet, then to CCF
-            return round(usage_float / CF_TO_GALLON / CF_PER_CCF, 2)
+    # The coordinator already holds data, so there is no need to update before adding
+    async_add_entities(sensors)
 
-        return usage
 
-    def _get_usage_unit(self):
-        """Determine the unit of measurement for usage sensors."""
-        config_unit_type = self.coordinator.config_entry.data.get("unit_type")
+class SensusAnalyticsSensorBase(CoordinatorEntity, SensorEntity):
+    """Base class for all Sensus Analytics sensors."""
 
-        # Return the user's configured unit type
-        # The _convert_usage method handles the actual value conversion
-        if config_unit_type == "gal":
-            return "gal"
-        if config_unit_type == "CCF":
-            return "CCF"
+    _last_state_key = None
 
-        # Fallback to API-reported unit if config is unexpected
-        return self.coordinator.data.get("usageUnit")
-
-
-class DynamicUnitSensorBase(UsageConversionMixin, CoordinatorEntity, SensorEntity):
+    @property
+    def available(self):
+        """Return True while the coordinator has current or recent data."""
+        return self.coordinator.last_update_success or self.coordinator.has_fresh_data
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_state_key = self._state_key()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when something visible in it has changed."""
+        state_key = self._state_key()
+        if state_key == self._last_state_key:
+            return
+        self._last_state_key = state_key
+        self.async_write_ha_state()
+
+    def _state_key(self):
+        """Return the values that make up the written state."""
+        return (self.available, self.native_value, self.native_unit_of_measurement, self.last_reset)
+
+
+class DynamicUnitSensorBase(SensusAnalyticsSensorBase):
     """Base class for sensors with dynamic units."""
 
     def __init__(self, coordinator, entry):
@@ -107,10 +85,10 @@ class DynamicUnitSensorBase(UsageConversionMixin, CoordinatorEntity, SensorEntit
     @property
     def native_unit_of_measurement(self):
         """Return the unit of measurement."""
-        return self._get_usage_unit()
+        return self.coordinator.derived.usage_unit
 
 
-class StaticUnitSensorBase(UsageConversionMixin, CoordinatorEntity, SensorEntity):
+class StaticUnitSensorBase(SensusAnalyticsSensorBase):
     """Base class for sensors with static units."""
 
     def __init__(self, coordinator, entry, unit=None, device_class=None):
@@ -146,13 +124,12 @@ class SensusAnalyticsDailyUsageSensor(DynamicUnitSensorBase):
     @property
     def last_reset(self):
         """Return the last reset time for the daily usage sensor."""
-        return dt_util.start_of_local_day()
+        return self.coordinator.derived.start_of_day
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        daily_usage = self.coordinator.data.get("dailyUsage")
-        return self._convert_usage(daily_usage)
+        return self.coordinator.derived.daily_usage
 
 
 class SensusAnalyticsUsageUnitSensor(StaticUnitSensorBase):
@@ -167,7 +144,7 @@ class SensusAnalyticsUsageUnitSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("usageUnit")
+        return self.coordinator.derived.metadata.native_usage_unit
 
 
 class SensusAnalyticsMeterAddressSensor(StaticUnitSensorBase):
@@ -183,7 +160,7 @@ class SensusAnalyticsMeterAddressSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("meterAddress1")
+        return self.coordinator.derived.metadata.meter_address
 
 
 class SensusAnalyticsLastReadSensor(StaticUnitSensorBase):
@@ -204,14 +181,7 @@ class SensusAnalyticsLastReadSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        last_read_ts = self.coordinator.data.get("lastRead")
-        if last_read_ts:
-            # Convert milliseconds to seconds for timestamp
-            try:
-                return dt_util.utc_from_timestamp(last_read_ts / 1000)
-            except (ValueError, TypeError):
-                return None
-        return None
+        return self.coordinator.derived.last_read
 
 
 class SensusAnalyticsMeterLongitudeSensor(StaticUnitSensorBase):
@@ -227,7 +197,7 @@ class SensusAnalyticsMeterLongitudeSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("meterLong")
+        return self.coordinator.derived.metadata.meter_longitude
 
 
 class SensusAnalyticsMeterIdSensor(StaticUnitSensorBase):
@@ -243,7 +213,7 @@ class SensusAnalyticsMeterIdSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("meterId")
+        return self.coordinator.derived.metadata.meter_id
 
 
 class SensusAnalyticsMeterLatitudeSensor(StaticUnitSensorBase):
@@ -259,7 +229,7 @@ class SensusAnalyticsMeterLatitudeSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get("meterLat")
+        return self.coordinator.derived.metadata.meter_latitude
 
 
 class MeterOdometerSensor(DynamicUnitSensorBase):
@@ -282,8 +252,7 @@ class MeterOdometerSensor(DynamicUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        latest_read_usage = self.coordinator.data.get("latestReadUsage")
-        return self._convert_usage(latest_read_usage)
+        return self.coordinator.derived.meter_odometer
 
 
 class SensusAnalyticsBillingUsageSensor(DynamicUnitSensorBase):
@@ -301,15 +270,12 @@ class SensusAnalyticsBillingUsageSensor(DynamicUnitSensorBase):
     @property
     def last_reset(self):
         """Return the last reset time for the billing usage sensor."""
-        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-        now = datetime.now(local_tz)
-        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return self.coordinator.derived.start_of_month
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        billing_usage = self.coordinator.data.get("billingUsage")
-        return self._convert_usage(billing_usage)
+        return self.coordinator.derived.billing_usage
 
 
 class SensusAnalyticsBillingCostSensor(StaticUnitSensorBase):
@@ -327,46 +293,7 @@ class SensusAnalyticsBillingCostSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        usage = self.coordinator.data.get("billingUsage")
-        if usage is None:
-            return None
-        usage_gallons = self._convert_usage(usage)
-        return self._calculate_cost(usage_gallons)
-
-    def _calculate_cost(self, usage_gallons):
-        """Calculate the billing cost based on tiers and service fee."""
-        tier1_gallons = self.coordinator.config_entry.data.get("tier1_gallons") or 0
-        tier1_price = self.coordinator.config_entry.data.get("tier1_price")
-        tier2_gallons = self.coordinator.config_entry.data.get("tier2_gallons") or 0
-        tier2_price = self.coordinator.config_entry.data.get("tier2_price") or 0
-        tier3_price = self.coordinator.config_entry.data.get("tier3_price") or 0
-        service_fee = self.coordinator.config_entry.data.get("service_fee")
-
-        cost = service_fee
-        if usage_gallons is not None:
-            if tier1_gallons == 0:
-                # No tier 1 limit, all usage is charged at tier 1 price
-                cost += usage_gallons * tier1_price
-            elif tier2_gallons == 0:
-                # No tier 2 limit, calculate for tier 1 and tier 2
-                if usage_gallons <= tier1_gallons:
-                    cost += usage_gallons * tier1_price
-                else:
-                    cost += tier1_gallons * tier1_price
-                    cost += (usage_gallons - tier1_gallons) * tier2_price
-            elif tier3_price > 0:
-                # Calculate for all three tiers
-                if usage_gallons <= tier1_gallons:
-                    cost += usage_gallons * tier1_price
-                elif usage_gallons <= tier1_gallons + tier2_gallons:
-                    cost += tier1_gallons * tier1_price
-                    cost += (usage_gallons - tier1_gallons) * tier2_price
-                else:
-                    cost += tier1_gallons * tier1_price
-                    cost += tier2_gallons * tier2_price
-                    cost += (usage_gallons - tier1_gallons - tier2_gallons) * tier3_price
-
-        return round(cost, 2)
+        return self.coordinator.derived.billing_cost
 
 
 class SensusAnalyticsDailyFeeSensor(StaticUnitSensorBase):
@@ -384,45 +311,7 @@ class SensusAnalyticsDailyFeeSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        usage = self.coordinator.data.get("dailyUsage")
-        if usage is None:
-            return None
-        usage_gallons = self._convert_usage(usage)
-        return self._calculate_daily_fee(usage_gallons)
-
-    def _calculate_daily_fee(self, usage_gallons):
-        """Calculate the daily fee based on tiers."""
-        tier1_gallons = self.coordinator.config_entry.data.get("tier1_gallons") or 0
-        tier1_price = self.coordinator.config_entry.data.get("tier1_price")
-        tier2_gallons = self.coordinator.config_entry.data.get("tier2_gallons") or 0
-        tier2_price = self.coordinator.config_entry.data.get("tier2_price") or 0
-        tier3_price = self.coordinator.config_entry.data.get("tier3_price") or 0
-
-        cost = 0
-        if usage_gallons is not None:
-            if tier1_gallons == 0:
-                # No tier 1 limit, all usage is charged at tier 1 price
-                cost += usage_gallons * tier1_price
-            elif tier2_gallons == 0:
-                # No tier 2 limit, calculate for tier 1 and tier 2
-                if usage_gallons <= tier1_gallons:
-                    cost += usage_gallons * tier1_price
-                else:
-                    cost += tier1_gallons * tier1_price
-                    cost += (usage_gallons - tier1_gallons) * tier2_price
-            elif tier3_price > 0:
-                # Calculate for all three tiers
-                if usage_gallons <= tier1_gallons:
-                    cost += usage_gallons * tier1_price
-                elif usage_gallons <= tier1_gallons + tier2_gallons:
-                    cost += tier1_gallons * tier1_price
-                    cost += (usage_gallons - tier1_gallons) * tier2_price
-                else:
-                    cost += tier1_gallons * tier1_price
-                    cost += tier2_gallons * tier2_price
-                    cost += (usage_gallons - tier1_gallons - tier2_gallons) * tier3_price
-
-        return round(cost, 2)
+        return self.coordinator.derived.daily_fee
 
 
 class LastHourUsageSensor(DynamicUnitSensorBase):
@@ -440,28 +329,12 @@ class LastHourUsageSensor(DynamicUnitSensorBase):
     @property
     def last_reset(self):
         """Return the last reset time for the last hour usage sensor."""
-        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-        now = datetime.now(local_tz)
-        return now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+        return self.coordinator.derived.last_hour_start
 
     @property
     def native_value(self):
         """Return the usage for the current hour from the previous day."""
-        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-        now = datetime.now(local_tz)
-        target_hour = now.hour
-        hourly_data = self.coordinator.data.get("hourly_usage_data", [])
-        if not hourly_data:
-            return None
-
-        # Find the data corresponding to target_hour from the previous day
-        for entry in hourly_data:
-            entry_time = dt_util.utc_from_timestamp(entry["timestamp"] / 1000).astimezone(local_tz)
-            if entry_time.hour == target_hour:
-                usage = entry["usage"]
-                usage_unit = entry.get("usage_unit")
-                return self._convert_usage(usage, usage_unit)
-        return None
+        return self.coordinator.derived.last_hour_usage
 
 
 class LastHourRainfallSensor(StaticUnitSensorBase):
@@ -477,19 +350,8 @@ class LastHourRainfallSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the rainfall for the current hour from the previous day."""
-        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-        now = datetime.now(local_tz)
-        target_hour = now.hour
-        hourly_data = self.coordinator.data.get("hourly_usage_data", [])
-        if not hourly_data:
-            return None
-
-        for entry in hourly_data:
-            entry_time = dt_util.utc_from_timestamp(entry["timestamp"] / 1000).astimezone(local_tz)
-            if entry_time.hour == target_hour:
-                rain = entry["rain"]
-                return rain
-        return None
+        last_hour = self.coordinator.derived.last_hour
+        return None if last_hour is None else last_hour.rain
 
 
 class LastHourTemperatureSensor(StaticUnitSensorBase):
@@ -505,19 +367,8 @@ class LastHourTemperatureSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the temperature for the current hour from the previous day."""
-        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-        now = datetime.now(local_tz)
-        target_hour = now.hour
-        hourly_data = self.coordinator.data.get("hourly_usage_data", [])
-        if not hourly_data:
-            return None
-
-        for entry in hourly_data:
-            entry_time = dt_util.utc_from_timestamp(entry["timestamp"] / 1000).astimezone(local_tz)
-            if entry_time.hour == target_hour:
-                temp = entry["temp"]
-                return temp
-        return None
+        last_hour = self.coordinator.derived.last_hour
+        return None if last_hour is None else last_hour.temp
 
 
 class LastHourTimestampSensor(StaticUnitSensorBase):
@@ -533,17 +384,47 @@ class LastHourTimestampSensor(StaticUnitSensorBase):
     @property
     def native_value(self):
         """Return the timestamp for the current hour's data from the previous day."""
-        local_tz = dt_util.get_time_zone(self.hass.config.time_zone)
-        now = datetime.now(local_tz)
-        target_hour = now.hour
-        hourly_data = self.coordinator.data.get("hourly_usage_data", [])
-        if not hourly_data:
-            return None
-
-        for entry in hourly_data:
-            entry_timestamp_ms = entry["timestamp"]
-            entry_time = dt_util.utc_from_timestamp(entry_timestamp_ms / 1000).astimezone(local_tz)
-            if entry_time.hour == target_hour:
-                # Return the timestamp as a formatted string
-                return entry_time.strftime("%Y-%m-%d %H:%M:%S")
-        return None
+        return self.coordinator.derived.last_hour_time
+
+
+class SensusAnalyticsRefreshDurationSensor(StaticUnitSensorBase):
+    """Representation of the diagnostic refresh duration sensor."""
+
+    def __init__(self, coordinator, entry):
+        """Initialize the refresh duration sensor."""
+        super().__init__(
+            coordinator,
+            entry,
+            unit=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+        )
+        self._attr_name = f"{DEFAULT_NAME} Refresh Duration"
+        self._attr_unique_id = f"{self._unique_id}_refresh_duration"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        """Return the duration of the last refresh in milliseconds."""
+        return self.coordinator.metrics.last_duration("refresh")
+
+
+class SensusAnalyticsReauthCountSensor(StaticUnitSensorBase):
+    """Representation of the diagnostic re-authentication count sensor."""
+
+    def __init__(self, coordinator, entry):
+        """Initialize the re-authentication count sensor."""
+        super().__init__(coordinator, entry, unit=None)
+        self._attr_name = f"{DEFAULT_NAME} Re-authentications"
+        self._attr_unique_id = f"{self._unique_id}_reauth_count"
+        self._attr_icon = "mdi:account-key"
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        """Return how often the portal session had to be renewed."""
+        return self.coordinator.session.reauth_count
@@ -0,0 +1,197 @@
+"""Services of the Sensus Analytics Integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END,
+    ATTR_END_DATE,
+    ATTR_INTERVAL,
+    ATTR_MAX_CONCURRENCY,
+    ATTR_START,
+    ATTR_START_DATE,
+    ATTR_WINDOW_HOURS,
+    DEFAULT_FETCH_RANGE_CONCURRENCY,
+    DOMAIN,
+    INTERVAL_DAY,
+    INTERVAL_MONTH,
+    SERVICE_FETCH_RANGE,
+    SERVICE_GET_ARCHIVED_USAGE,
+    SERVICE_GET_USAGE_HISTORY,
+)
+from .conversion import convert_usage
+from .coordinator import ZOOM_MONTH, ZOOM_YEAR, SensusAnalyticsDataUpdateCoordinator, usage_series_range
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, REQUEST_PRIORITY
+
+FETCH_RANGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_FETCH_RANGE_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=16)
+        ),
+    }
+)
+
+GET_USAGE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_INTERVAL, default=INTERVAL_DAY): vol.In([INTERVAL_DAY, INTERVAL_MONTH]),
+    }
+)
+
+GET_ARCHIVED_USAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Required(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_WINDOW_HOURS): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 366)),
+    }
+)
+
+# Zoom level returning one point per requested interval
+INTERVAL_ZOOM = {INTERVAL_DAY: ZOOM_MONTH, INTERVAL_MONTH: ZOOM_YEAR}
+
+
+def _get_coordinator(call: ServiceCall) -> SensusAnalyticsDataUpdateCoordinator:
+    """Return the coordinator of the entry a call targets."""
+    coordinator = call.hass.data.get(DOMAIN, {}).get(call.data[ATTR_CONFIG_ENTRY_ID])
+    if not isinstance(coordinator, SensusAnalyticsDataUpdateCoordinator):
+        raise ServiceValidationError(f"Config entry {call.data[ATTR_CONFIG_ENTRY_ID]} is not loaded")
+    return coordinator
+
+
+async def _async_fetch_range(call: ServiceCall) -> ServiceResponse:
+    """Fetch the hourly usage of a date range and import it into long-term statistics."""
+    coordinator = _get_coordinator(call)
+    start_date = call.data[ATTR_START_DATE]
+    # Today's hours are still arriving; the regular import picks them up
+    end_date = min(call.data[ATTR_END_DATE], dt_util.now().date() - timedelta(days=1))
+    if start_date > end_date:
+        raise ServiceValidationError("start_date must not be after end_date or yesterday")
+
+    # A long range must not hold up the regular polls on the same host
+    token = REQUEST_PRIORITY.set(PRIORITY_BACKGROUND)
+    try:
+        result = await coordinator.statistics_importer.async_backfill(
+            start_date, end_date, call.data[ATTR_MAX_CONCURRENCY]
+        )
+    finally:
+        REQUEST_PRIORITY.reset(token)
+    remaining = None
+    if result.stopped_at is not None:
+        # A day failed to fetch; the caller can request the rest again
+        remaining = {"start_date": result.stopped_at.isoformat(), "end_date": result.end_date.isoformat()}
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "imported_hours": result.imported,
+        "remaining": remaining,
+    }
+
+
+async def _async_get_usage_history(call: ServiceCall) -> ServiceResponse:
+    """Return the usage of a date range per day or per month."""
+    coordinator = _get_coordinator(call)
+    start_date, end_date = call.data[ATTR_START_DATE], call.data[ATTR_END_DATE]
+    if start_date > end_date:
+        raise ServiceValidationError("start_date must not be after end_date")
+
+    zoom = INTERVAL_ZOOM[call.data[ATTR_INTERVAL]]
+    # Someone is waiting for the response
+    token = REQUEST_PRIORITY.set(PRIORITY_INTERACTIVE)
+    try:
+        series = await coordinator.async_get_usage_series(start_date, end_date, zoom)
+    finally:
+        REQUEST_PRIORITY.reset(token)
+    if series is None:
+        raise HomeAssistantError("The usage history could not be retrieved from the portal")
+
+    unit_type = coordinator.config_entry.data.get("unit_type")
+    usage = [
+        {
+            "start": dt_util.as_local(dt_util.utc_from_timestamp(reading.timestamp / 1000)).date().isoformat(),
+            "usage": convert_usage(reading.usage, series.usage_unit, unit_type),
+        }
+        for reading in series
+    ]
+    start_date, end_date = usage_series_range(start_date, end_date, zoom)
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "unit": unit_type,
+        "total": sum(row["usage"] for row in usage if row["usage"] is not None),
+        "usage": usage,
+    }
+
+
+async def _async_get_archived_usage(call: ServiceCall) -> ServiceResponse:
+    """Return the archived usage of a period, optionally as rolling totals."""
+    coordinator = _get_coordinator(call)
+    start, end = (dt_util.as_local(call.data[key]) for key in (ATTR_START, ATTR_END))
+    if start >= end:
+        raise ServiceValidationError("start must be before end")
+    start_ts, end_ts = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+    archive = coordinator.archive
+    try:
+        info = await archive.async_info()
+        total, known_hours = await archive.async_total_usage(start_ts, end_ts)
+        rolling = None
+        if window_hours := call.data.get(ATTR_WINDOW_HOURS):
+            rolling = await archive.async_rolling_sums(start_ts, end_ts, window_hours)
+    except (OSError, ValueError) as err:
+        raise HomeAssistantError(f"The usage archive could not be read: {err}") from err
+
+    unit_type = coordinator.config_entry.data.get("unit_type")
+    response = {
+        "unit": unit_type,
+        "total": convert_usage(total, info.get("unit"), unit_type) if known_hours else None,
+        "known_hours": known_hours,
+    }
+    if rolling is not None:
+        response["rolling"] = [
+            {
+                "start": dt_util.as_local(dt_util.utc_from_timestamp(timestamp / 1000)).isoformat(),
+                "usage": convert_usage(usage, info.get("unit"), unit_type),
+            }
+            for timestamp, usage in rolling
+        ]
+    return response
+
+
+@callback
+def async_setup_services(hass: HomeAssistant):
+    """Register the integration's services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FETCH_RANGE,
+        _async_fetch_range,
+        schema=FETCH_RANGE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_USAGE_HISTORY,
+        _async_get_usage_history,
+        schema=GET_USAGE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ARCHIVED_USAGE,
+        _async_get_archived_usage,
+        schema=GET_ARCHIVED_USAGE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,211 @@
+"""Backfill Sensus Analytics hourly usage into long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import aclosing
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.unit_conversion import VolumeConverter
+
+from .const import CONF_BACKFILL_DAYS, DEFAULT_BACKFILL_DAYS, DEFAULT_NAME, DOMAIN
+from .conversion import convert_usage
+from .scheduler import PRIORITY_BACKGROUND, REQUEST_PRIORITY
+
+if TYPE_CHECKING:
+    from .coordinator import SensusAnalyticsDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Days fetched before their hours are handed to the recorder in one import
+BACKFILL_BATCH_DAYS = 7
+# Pause between two usage requests so a long backfill doesn't hammer the portal
+BACKFILL_REQUEST_INTERVAL = 1.0
+# How often an import of newly available hours is attempted
+BACKFILL_RETRY_INTERVAL = timedelta(hours=1)
+
+
+def statistics_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the import progress of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics")
+
+
+class BackfillResult(NamedTuple):
+    """Outcome of a backfill run."""
+
+    imported: int
+    # Last day of the range, which is later than requested when already imported days were imported again
+    end_date: date
+    # First day that was not completely imported, or None if the whole range was
+    stopped_at: date | None
+
+
+class SensusAnalyticsStatisticsImporter:  # pylint: disable=too-many-instance-attributes
+    """Import hourly usage as external statistics, resuming from a watermark.
+
+    Days are walked oldest first and, for the scheduled backfill, fetched one
+    request at a time with a pause in between; a range fetch may have several
+    days in flight, which still arrive in order. Hours are imported in batches
+    of several days, and one import runs at a time per meter. The
+    watermark (the last imported hour and the running sum at that hour) is
+    persisted after every batch, so later runs only import new hours. A range
+    starting before the first imported hour extends the history backwards:
+    the import restarts there and runs through the watermark again, so the
+    sums of the hours already imported are recomputed on top of the older
+    ones. Gaps are only skipped on days that can no longer change; a gap on
+    the most recent day stops the run so the missing hours are picked up once
+    they arrive.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: SensusAnalyticsDataUpdateCoordinator):
+        """Initialize the importer."""
+        self.hass = hass
+        self.coordinator = coordinator
+        entry = coordinator.config_entry
+        self.statistic_id = f"{DOMAIN}:{slugify(f'{coordinator.account_number}_{coordinator.meter_number}_usage')}"
+        self._store = statistics_store(hass, entry.entry_id)
+        self._first: int | None = None
+        self._watermark: int | None = None
+        self._sum = 0.0
+        self._loaded = False
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._last_attempt: datetime | None = None
+
+    @callback
+    def async_schedule(self):
+        """Start an import in the background when one is due."""
+        backfill_days = self.coordinator.config_entry.data.get(CONF_BACKFILL_DAYS, DEFAULT_BACKFILL_DAYS)
+        if not backfill_days or (self._task is not None and not self._task.done()):
+            return
+        now = dt_util.utcnow()
+        if self._last_attempt is not None and now - self._last_attempt < BACKFILL_RETRY_INTERVAL:
+            return
+        self._last_attempt = now
+        end_date = dt_util.now().date() - timedelta(days=1)
+        # The task inherits the priority, so its requests queue behind every poll on the host
+        token = REQUEST_PRIORITY.set(PRIORITY_BACKGROUND)
+        try:
+            self._task = self.coordinator.config_entry.async_create_background_task(
+                self.hass,
+                self.async_backfill(end_date - timedelta(days=backfill_days - 1), end_date),
+                f"{DOMAIN}_statistics_backfill",
+            )
+        finally:
+            REQUEST_PRIORITY.reset(token)
+
+    async def async_backfill(self, start_date: date, end_date: date, max_concurrency=1):
+        """Import the hourly usage for start_date through end_date, inclusive.
+
+        The import stops at the first day that failed to fetch, or at a gap on
+        the last day; the returned BackfillResult names that day, from which
+        the next run resumes.
+        """
+        async with self._lock:
+            await self._async_load()
+            if self._watermark is not None:
+                watermark_date = _local_date(self._watermark)
+                if self._first is not None and start_date < _local_date(self._first):
+                    # Import the older days, then every day already imported again with the sums recomputed
+                    _LOGGER.debug("Extending the statistics for %s back to %s", self.statistic_id, start_date)
+                    self._first, self._watermark, self._sum = None, None, 0.0
+                    end_date = max(end_date, watermark_date)
+                else:
+                    # Resume on the day of the last imported hour; earlier days are done
+                    start_date = max(start_date, watermark_date)
+            if start_date > end_date:
+                return BackfillResult(0, end_date, None)
+
+            _LOGGER.debug("Backfilling statistics for %s from %s to %s", self.statistic_id, start_date, end_date)
+            imported = 0
+            stopped_at = None
+            statistics: list[StatisticData] = []
+            days = self.coordinator.async_iter_hourly_series(start_date, end_date, max_concurrency)
+            async with aclosing(days):
+                async for current, series in days:
+                    if series is None:
+                        # Skipping the day would leave a hole below the watermark; resume there next run
+                        _LOGGER.warning(
+                            "Stopping the statistics import for %s at %s, which failed to fetch",
+                            self.statistic_id,
+                            current,
+                        )
+                        stopped_at = current
+                        break
+                    if not self._append_statistics(statistics, series, final=current < end_date):
+                        stopped_at = current
+                        break
+                    if (current - start_date).days % BACKFILL_BATCH_DAYS == BACKFILL_BATCH_DAYS - 1:
+                        imported += await self._async_import(statistics)
+                        statistics = []
+                    if max_concurrency == 1:
+                        await asyncio.sleep(BACKFILL_REQUEST_INTERVAL)
+
+            imported += await self._async_import(statistics)
+            return BackfillResult(imported, end_date, stopped_at)
+
+    def _append_statistics(self, statistics: list[StatisticData], series, final: bool) -> bool:
+        """Add the readings after the watermark; return False if stopped at a gap."""
+        unit_type = self.coordinator.config_entry.data.get("unit_type")
+        for reading in series:
+            if self._watermark is not None and reading.timestamp <= self._watermark:
+                continue
+            if reading.usage is None:
+                if final:
+                    continue
+                return False
+            usage = float(convert_usage(reading.usage, series.usage_unit, unit_type))
+            self._sum += usage
+            if self._first is None:
+                self._first = reading.timestamp
+            self._watermark = reading.timestamp
+            start = dt_util.utc_from_timestamp(reading.timestamp / 1000).replace(minute=0, second=0, microsecond=0)
+            statistics.append(StatisticData(start=start, state=usage, sum=self._sum))
+        return True
+
+    async def _async_import(self, statistics: list[StatisticData]):
+        """Hand a batch of statistics to the recorder, persist the watermark and return the batch size."""
+        if not statistics:
+            return 0
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=f"{DEFAULT_NAME} {self.coordinator.meter_number} Hourly Usage",
+            source=DOMAIN,
+            statistic_id=self.statistic_id,
+            unit_class=VolumeConverter.UNIT_CLASS,
+            unit_of_measurement=self.coordinator.config_entry.data.get("unit_type"),
+        )
+        async_add_external_statistics(self.hass, metadata, statistics)
+        await self._store.async_save(
+            {"statistic_id": self.statistic_id, "first": self._first, "watermark": self._watermark, "sum": self._sum}
+        )
+        _LOGGER.debug("Imported %s hourly statistics for %s", len(statistics), self.statistic_id)
+        return len(statistics)
+
+    async def _async_load(self):
+        """Load the persisted watermark of this meter's statistic once."""
+        if self._loaded:
+            return
+        stored = await self._store.async_load()
+        # The store belongs to the entry, which may have been reconfigured for another meter since
+        if stored and stored.get("statistic_id") == self.statistic_id:
+            self._first = stored.get("first")
+            self._watermark = stored.get("watermark")
+            self._sum = stored.get("sum", 0.0)
+        self._loaded = True
+
+
+def _local_date(timestamp) -> date:
+    """Return the local date of a millisecond timestamp."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp / 1000)).date()
@@ -0,0 +1,113 @@
+"""Tiered water tariff for the Sensus Analytics Integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+
+
+class Tariff:
+    """Tiered tariff compiled once from the config entry.
+
+    Each tier has a size and a price per unit; the last tier has no size and
+    covers all remaining usage. Breakpoints are stored cumulatively together
+    with the cost of all usage up to each breakpoint, so the cost of a single
+    value is one bisect, and a whole series is costed in one pass.
+    """
+
+    __slots__ = ("service_fee", "_breakpoints", "_prices", "_base_costs")
+
+    def __init__(self, tiers: Iterable[tuple[float | None, float]], service_fee=0.0):
+        """Compile the tiers, given as (size, price) pairs in order."""
+        self.service_fee = service_fee or 0.0
+        self._breakpoints = [0.0]
+        self._prices = []
+        self._base_costs = [0.0]
+        for size, price in tiers:
+            self._prices.append(price)
+            if size is None:
+                break
+            self._base_costs.append(self._base_costs[-1] + size * price)
+            self._breakpoints.append(self._breakpoints[-1] + size)
+        else:
+            # Usage beyond the last sized tier is not charged
+            self._prices.append(0.0)
+
+    @classmethod
+    def from_config(cls, data: Mapping) -> Tariff:
+        """Build the tariff from ``tierN_gallons``/``tierN_price`` config entry keys.
+
+        Tiers are read in order until one has no size; that tier and its price
+        then cover the rest of the usage.
+        """
+        tiers = []
+        tier = 1
+        while True:
+            price = data.get(f"tier{tier}_price") or 0.0
+            size = data.get(f"tier{tier}_gallons") or 0
+            if not size:
+                tiers.append((None, price))
+                break
+            tiers.append((size, price))
+            tier += 1
+        return cls(tiers, data.get("service_fee"))
+
+    def usage_cost(self, usage):
+        """Return the cost of a usage amount, without the service fee."""
+        if usage is None:
+            return None
+        tier = bisect_right(self._breakpoints, usage) - 1
+        tier = max(tier, 0)
+        return self._base_costs[tier] + (usage - self._breakpoints[tier]) * self._prices[tier]
+
+    def cost(self, usage, include_service_fee=False):
+        """Return the rounded cost of a usage amount, optionally with the service fee."""
+        if usage is None:
+            return None
+        cost = self.usage_cost(usage)
+        if include_service_fee:
+            cost += self.service_fee
+        return round(cost, 2)
+
+    def incremental_costs(self, usages: Iterable[float | None], start_usage=0.0) -> list[float | None]:
+        """Return the cost of each usage value, consumed in order from start_usage.
+
+        This prices e.g. the days or hours of a billing period against the tier
+        each one actually falls into, walking the tiers once for the whole series.
+        """
+        costs = []
+        total = start_usage
+        tier = max(bisect_right(self._breakpoints, total) - 1, 0)
+        last_tier = len(self._prices) - 1
+        for usage in usages:
+            if usage is None:
+                costs.append(None)
+                continue
+            cost = 0.0
+            remaining = usage
+            while remaining > 0:
+                if tier < last_tier:
+                    step = min(remaining, self._breakpoints[tier + 1] - total)
+                else:
+                    step = remaining
+                cost += step * self._prices[tier]
+                total += step
+                remaining -= step
+                if tier < last_tier and total >= self._breakpoints[tier + 1]:
+                    tier += 1
+            costs.append(cost)
+        return costs
+
+    def period_costs(self, period_usage, latest_usage):
+        """Return the rounded (period cost with service fee, cost of the latest usage) of a billing period.
+
+        period_usage includes latest_usage, which is priced at the tiers the
+        rest of the period has already reached. Both come from one pass.
+        """
+        if period_usage is None:
+            return None, self.cost(latest_usage)
+        if latest_usage is None:
+            return self.cost(period_usage, include_service_fee=True), None
+        latest_usage = min(latest_usage, period_usage)
+        costs = self.incremental_costs((period_usage - latest_usage, latest_usage))
+        return round(sum(costs) + self.service_fee, 2), round(costs[-1], 2)
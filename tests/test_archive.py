@@ -0,0 +1,84 @@
+"""Tests for the hourly usage archive."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.sensus_analytics.archive import HOUR_MS, HourlyArchive  # noqa: E402
+from custom_components.sensus_analytics.hourly import HourlySeries  # noqa: E402
+
+FIRST_HOUR = 480_000
+
+
+def _series(hours, usage=1.0):
+    """Return a series with the same usage in each of the given hours."""
+    series = HourlySeries(usage_unit="GAL")
+    for hour in hours:
+        series.append(hour * HOUR_MS, usage, None, None)
+    return series
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Return an archive holding 1.0 for each of ten hours."""
+    archive = HourlyArchive(None, tmp_path / "meter.archive")
+    archive.append(_series(range(FIRST_HOUR, FIRST_HOUR + 10)))
+    return archive
+
+
+@pytest.mark.parametrize("window_hours", [1, 2, 3])
+def test_rolling_sums_full_windows(archive, window_hours):
+    """Windows that lie within the data sum exactly window_hours readings."""
+    start = (FIRST_HOUR + 3) * HOUR_MS
+    end = (FIRST_HOUR + 10) * HOUR_MS
+    sums = archive.rolling_sums(start, end, window_hours)
+    assert [timestamp for timestamp, _ in sums] == list(range(start, end, HOUR_MS))
+    assert [total for _, total in sums] == [float(window_hours)] * 7
+
+
+def test_rolling_sums_partial_windows(archive):
+    """Windows that reach before or after the data only count the known hours."""
+    sums = archive.rolling_sums((FIRST_HOUR - 1) * HOUR_MS, (FIRST_HOUR + 13) * HOUR_MS, 3)
+    assert [total for _, total in sums] == [None, 1.0, 2.0] + [3.0] * 8 + [2.0, 1.0, None]
+
+
+def test_rolling_sums_matches_total_usage(archive):
+    """Every rolling sum equals the total over its window."""
+    archive.append(_series([FIRST_HOUR + 12, FIRST_HOUR + 15], usage=2.5))
+    for timestamp, total in archive.rolling_sums(FIRST_HOUR * HOUR_MS, (FIRST_HOUR + 20) * HOUR_MS, 4):
+        expected, known = archive.total_usage(timestamp - 3 * HOUR_MS, timestamp + HOUR_MS)
+        assert total == (expected if known else None)
+
+
+def test_empty_file_is_no_archive(tmp_path):
+    """An empty file reads as an archive without records and is written over."""
+    path = tmp_path / "meter.archive"
+    path.touch()
+    archive = HourlyArchive(None, path)
+    assert archive.total_usage(0, FIRST_HOUR * HOUR_MS) == (0.0, 0)
+    assert archive.append(_series([FIRST_HOUR])) == 1
+    assert archive.total_usage(FIRST_HOUR * HOUR_MS, (FIRST_HOUR + 1) * HOUR_MS) == (1.0, 1)
+
+
+def test_truncated_header(tmp_path):
+    """A header cut short is reported as a ValueError."""
+    path = tmp_path / "meter.archive"
+    path.write_bytes(b"SNSA\x01")
+    with pytest.raises(ValueError):
+        HourlyArchive(None, path).total_usage(0, HOUR_MS)
+
+
+def test_missing_archive(tmp_path):
+    """Queries on an archive that was never written return nothing."""
+    archive = HourlyArchive(None, tmp_path / "meter.archive")
+    assert archive.total_usage(0, FIRST_HOUR * HOUR_MS) == (0.0, 0)
+    assert not archive.rolling_sums(0, FIRST_HOUR * HOUR_MS, 3)
+    assert archive.info() == {"hours": 0}
+
+
+def test_remove(archive):
+    """Removing deletes the file and leaves an archive without records."""
+    archive.remove()
+    assert not archive.path.exists()
+    assert archive.info() == {"hours": 0}
+    archive.remove()
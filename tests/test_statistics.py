@@ -0,0 +1,97 @@
+"""Tests for the long-term statistics import."""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.sensus_analytics import statistics  # noqa: E402
+from custom_components.sensus_analytics.hourly import HourlySeries  # noqa: E402
+
+FIRST_DAY = date(2024, 1, 1)
+HOUR_MS = 3_600_000
+
+
+class MemoryStore:
+    """Store keeping the saved data in memory."""
+
+    def __init__(self, *_args):
+        """Initialize an empty store."""
+        self.data = None
+
+    async def async_load(self):
+        """Return the saved data."""
+        return self.data
+
+    async def async_save(self, data):
+        """Keep the data."""
+        self.data = data
+
+
+def _day_series(day):
+    """Return 24 hours of 1 gallon starting at midnight UTC of day."""
+    series = HourlySeries(usage_unit="GAL")
+    start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+    for hour in range(24):
+        series.append(start + hour * HOUR_MS, 1.0, None, None)
+    return series
+
+
+def _importer(failed_days=()):
+    """Return an importer whose coordinator fails to fetch the given days."""
+
+    async def iter_hourly_series(start_date, end_date, _max_concurrency):
+        day = start_date
+        while day <= end_date:
+            yield day, None if day in failed_days else _day_series(day)
+            day += timedelta(days=1)
+
+    coordinator = SimpleNamespace(
+        account_number="1000",
+        meter_number="100000",
+        config_entry=SimpleNamespace(entry_id="entry", data={"unit_type": "gal"}),
+        async_iter_hourly_series=iter_hourly_series,
+    )
+    with patch.object(statistics, "Store", MemoryStore):
+        return statistics.SensusAnalyticsStatisticsImporter(None, coordinator)
+
+
+@pytest.fixture(autouse=True)
+def _recorder():
+    """Collect the statistics handed to the recorder instead of writing them."""
+    imported = []
+    with (
+        patch.object(statistics, "async_add_external_statistics", lambda _hass, _meta, rows: imported.extend(rows)),
+        patch.object(statistics, "BACKFILL_REQUEST_INTERVAL", 0),
+        patch.object(statistics.dt_util, "as_local", lambda value: value),
+    ):
+        yield imported
+
+
+def test_backfill_stops_at_failed_day(_recorder):
+    """A day that failed to fetch is not skipped; the watermark stays before it."""
+    failed = FIRST_DAY + timedelta(days=1)
+    importer = _importer(failed_days={failed})
+    result = asyncio.run(importer.async_backfill(FIRST_DAY, FIRST_DAY + timedelta(days=3)))
+
+    assert result == statistics.BackfillResult(24, FIRST_DAY + timedelta(days=3), failed)
+    assert [row["sum"] for row in _recorder] == [float(hour) for hour in range(1, 25)]
+    watermark = datetime.fromtimestamp(importer._store.data["watermark"] / 1000, timezone.utc)
+    assert watermark == datetime(2024, 1, 1, 23, tzinfo=timezone.utc)
+
+
+def test_backfill_resumes_at_failed_day(_recorder):
+    """The next run picks up the failed day and keeps the running sum continuous."""
+    importer = _importer(failed_days={FIRST_DAY + timedelta(days=1)})
+    end_date = FIRST_DAY + timedelta(days=3)
+    asyncio.run(importer.async_backfill(FIRST_DAY, end_date))
+
+    importer.coordinator.async_iter_hourly_series = _importer().coordinator.async_iter_hourly_series
+    result = asyncio.run(importer.async_backfill(FIRST_DAY, end_date))
+
+    assert result == statistics.BackfillResult(72, end_date, None)
+    assert [row["sum"] for row in _recorder] == [float(hour) for hour in range(1, 97)]
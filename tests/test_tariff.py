@@ -0,0 +1,40 @@
+"""Tests for the tiered tariff."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.sensus_analytics.tariff import Tariff  # noqa: E402
+
+# 10 units at 1.0, 10 at 2.0, then 3.0 for the rest
+TIERS = ((10, 1.0), (10, 2.0), (None, 3.0))
+
+
+def test_incremental_costs_cross_tiers():
+    """Each value is priced at the tiers it falls into, given the usage before it."""
+    tariff = Tariff(TIERS)
+    assert tariff.incremental_costs([5, 10, None, 10]) == [5.0, 15.0, None, 25.0]
+
+
+def test_incremental_costs_match_total_cost():
+    """The costs of a series add up to the cost of its total, from any start."""
+    tariff = Tariff(TIERS)
+    usages = [0.5, 3, 7.25, 0, 12, 4]
+    for start in (0, 9.5, 25):
+        costs = tariff.incremental_costs(usages, start_usage=start)
+        assert sum(costs) == pytest.approx(tariff.usage_cost(start + sum(usages)) - tariff.usage_cost(start))
+
+
+def test_incremental_costs_beyond_last_sized_tier():
+    """Usage past the last sized tier is not charged."""
+    tariff = Tariff(((10, 1.0),))
+    assert tariff.incremental_costs([8, 8]) == [8.0, 2.0]
+
+
+def test_period_costs():
+    """The latest usage is priced at the tiers the period already reached."""
+    tariff = Tariff(TIERS, service_fee=15.0)
+    assert tariff.period_costs(25, 10) == (60.0, 25.0)
+    assert tariff.period_costs(25, None) == (60.0, None)
+    assert tariff.period_costs(None, 10) == (None, 10.0)
+    assert tariff.period_costs(5, 10) == (20.0, 5.0)